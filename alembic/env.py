@@ -11,7 +11,8 @@ from models.base import Base
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-from models.models import Product, Category, Tag
+# Импорт регистрирует таблицы моделей в Base.metadata (нужно для autogenerate)
+from models.models import Product, Category, Tag  # noqa: F401
 
 
 # Interpret the config file for Python logging.
@@ -25,6 +26,15 @@ if config.config_file_name is not None:
 # Подсказываем Alembic, где найти метаданные моделей
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Исключает из autogenerate полнотекстовый индекс products_fts
+    (виртуальная таблица FTS5 и её служебные таблицы не описаны в моделях).
+    """
+    return not (type_ == "table" and name.startswith("products_fts"))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -49,6 +59,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -69,7 +80,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,29 @@
+"""indexes for tag lookups and name search within category
+
+Revision ID: 2b6d1e4c9a70
+Revises: fb9867037f96
+Create Date: 2026-10-14 17:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b6d1e4c9a70'
+down_revision: Union[str, Sequence[str], None] = 'fb9867037f96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_product_tag_association_tag_id'), 'product_tag_association', ['tag_id'], unique=False)
+    op.create_index('ix_product_name_category', 'products', ['name', 'category_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_name_category', table_name='products')
+    op.drop_index(op.f('ix_product_tag_association_tag_id'), table_name='product_tag_association')
@@ -0,0 +1,159 @@
+"""products full-text search index
+
+Revision ID: fb9867037f96
+Revises: 4cc87d0bdce3
+Create Date: 2026-10-14 17:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fb9867037f96'
+down_revision: Union[str, Sequence[str], None] = '4cc87d0bdce3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQL зафиксирован в ревизии (а не импортирован из utils.db_initial),
+# чтобы последующие правки FTS_DDL в приложении не меняли уже применённую миграцию.
+# FTS5-таблица и триггеры, поддерживающие её в актуальном состоянии
+FTS_DDL = (
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts
+    USING fts5(name, description, category, tags)
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai
+    AFTER INSERT ON products
+    BEGIN
+        DELETE FROM products_fts
+        WHERE rowid IN (SELECT p.id FROM products p WHERE p.id = NEW.id);
+        INSERT INTO products_fts (rowid, name, description, category, tags)
+        SELECT p.id, p.name, p.description, c.name,
+               (SELECT group_concat(t.name, ' ')
+                FROM product_tag_association a JOIN tags t ON t.id = a.tag_id
+                WHERE a.product_id = p.id)
+        FROM products p LEFT JOIN categories c ON c.id = p.category_id
+        WHERE p.id = NEW.id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS products_fts_au
+    AFTER UPDATE OF name, description, category_id ON products
+    BEGIN
+        DELETE FROM products_fts
+        WHERE rowid IN (SELECT p.id FROM products p WHERE p.id = NEW.id);
+        INSERT INTO products_fts (rowid, name, description, category, tags)
+        SELECT p.id, p.name, p.description, c.name,
+               (SELECT group_concat(t.name, ' ')
+                FROM product_tag_association a JOIN tags t ON t.id = a.tag_id
+                WHERE a.product_id = p.id)
+        FROM products p LEFT JOIN categories c ON c.id = p.category_id
+        WHERE p.id = NEW.id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products
+    BEGIN DELETE FROM products_fts WHERE rowid = OLD.id; END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS categories_fts_au
+    AFTER UPDATE OF name ON categories
+    WHEN OLD.name IS NOT NEW.name
+    BEGIN
+        DELETE FROM products_fts
+        WHERE rowid IN (SELECT p.id FROM products p WHERE p.category_id = NEW.id);
+        INSERT INTO products_fts (rowid, name, description, category, tags)
+        SELECT p.id, p.name, p.description, c.name,
+               (SELECT group_concat(t.name, ' ')
+                FROM product_tag_association a JOIN tags t ON t.id = a.tag_id
+                WHERE a.product_id = p.id)
+        FROM products p LEFT JOIN categories c ON c.id = p.category_id
+        WHERE p.category_id = NEW.id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS tags_fts_au
+    AFTER UPDATE OF name ON tags
+    WHEN OLD.name IS NOT NEW.name
+    BEGIN
+        DELETE FROM products_fts
+        WHERE rowid IN (SELECT p.id FROM products p WHERE p.id IN (SELECT product_id FROM product_tag_association WHERE tag_id = NEW.id));
+        INSERT INTO products_fts (rowid, name, description, category, tags)
+        SELECT p.id, p.name, p.description, c.name,
+               (SELECT group_concat(t.name, ' ')
+                FROM product_tag_association a JOIN tags t ON t.id = a.tag_id
+                WHERE a.product_id = p.id)
+        FROM products p LEFT JOIN categories c ON c.id = p.category_id
+        WHERE p.id IN (SELECT product_id FROM product_tag_association WHERE tag_id = NEW.id);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS product_tag_fts_ai
+    AFTER INSERT ON product_tag_association
+    BEGIN
+        DELETE FROM products_fts
+        WHERE rowid IN (SELECT p.id FROM products p WHERE p.id = NEW.product_id);
+        INSERT INTO products_fts (rowid, name, description, category, tags)
+        SELECT p.id, p.name, p.description, c.name,
+               (SELECT group_concat(t.name, ' ')
+                FROM product_tag_association a JOIN tags t ON t.id = a.tag_id
+                WHERE a.product_id = p.id)
+        FROM products p LEFT JOIN categories c ON c.id = p.category_id
+        WHERE p.id = NEW.product_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS product_tag_fts_ad
+    AFTER DELETE ON product_tag_association
+    BEGIN
+        DELETE FROM products_fts
+        WHERE rowid IN (SELECT p.id FROM products p WHERE p.id = OLD.product_id);
+        INSERT INTO products_fts (rowid, name, description, category, tags)
+        SELECT p.id, p.name, p.description, c.name,
+               (SELECT group_concat(t.name, ' ')
+                FROM product_tag_association a JOIN tags t ON t.id = a.tag_id
+                WHERE a.product_id = p.id)
+        FROM products p LEFT JOIN categories c ON c.id = p.category_id
+        WHERE p.id = OLD.product_id;
+    END
+    ''',
+)
+
+# Начальное заполнение индекса данными, которые уже есть в БД
+FTS_REBUILD = (
+    'DELETE FROM products_fts',
+    '''
+    INSERT INTO products_fts (rowid, name, description, category, tags)
+    SELECT p.id, p.name, p.description, c.name,
+           (SELECT group_concat(t.name, ' ')
+            FROM product_tag_association a JOIN tags t ON t.id = a.tag_id
+            WHERE a.product_id = p.id)
+    FROM products p LEFT JOIN categories c ON c.id = p.category_id
+    ''',
+)
+
+FTS_TRIGGERS = (
+    'products_fts_ai',
+    'products_fts_au',
+    'products_fts_ad',
+    'categories_fts_au',
+    'tags_fts_au',
+    'product_tag_fts_ai',
+    'product_tag_fts_ad',
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in (*FTS_DDL, *FTS_REBUILD):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in FTS_TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS products_fts')
@@ -2,19 +2,47 @@
 Конфигурация приложения через Pydantic Settings
 """
 
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+
+from pydantic import AliasChoices, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Настройки приложения"""
 
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+
     db_name: str = "products.db"
-    db_echo: bool = True
+    # SQL-логи выключены по умолчанию (включить: SQL_ECHO=1 или DB_ECHO=True)
+    db_echo: bool = Field(
+        default=False, validation_alias=AliasChoices("sql_echo", "db_echo")
+    )
+
+    # Пул соединений (QueuePool)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30
+    # Соединения старше N секунд пересоздаются при выдаче из пула (-1 - никогда)
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Размер LRU-кэша скомпилированных SQL-запросов engine (0 - кэш выключен)
+    db_query_cache_size: int = 1200
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Возвращает единственный экземпляр настроек.
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    .env читается при первом вызове, а не при импорте модуля, поэтому
+    переменные окружения можно переопределить до первого обращения.
+    """
+    return Settings()
 
 
-# Единственный экземпляр настроек
-settings = Settings()
+def __getattr__(name: str):
+    """Ленивый `config.settings` для старого кода (канонический путь - get_settings())."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,10 @@
 """
 Главная точка входа приложения.
+
+Запуск сценариев:
+    python main.py                  # все сценарии по очереди
+    python main.py demo_relations   # заполнение БД (категории, теги, продукты) и вывод
+    python main.py demo_search      # расширенный поиск продуктов
 """
 
 # ✅ ПЕРВЫМ ДЕЛОМ настраиваем логирование!
@@ -14,139 +19,159 @@ setup_logging(
 )
 
 # Теперь можем импортировать остальные модули
+import argparse
+from functools import cache
+
+from sqlalchemy.orm import sessionmaker
+
+from config import get_settings
+from utils.db import get_session_factory
 from utils.db_operations import (
-    get_engine,
-    get_session_factory,
-    category_create,
-    category_get_all,
-    tag_create,
-    tag_get_all,
-    product_create,
-    product_get_all,
+    bulk_seed,
+    category_get_all_orm,
+    tag_get_all_orm,
+    product_get_all_orm,
     product_search_advanced,
 )
 from utils.db_initial import create_tables
-from schemas.schemas import ProductCreate, CategoryCreate, TagCreate
+from utils.exceptions import DatabaseOperationError
+from schemas.schemas import ProductSeed, CategoryCreate, TagCreate
 
 # Логгер для main
 logger = logging.getLogger(__name__)
 
 
-def main():
+@cache
+def bootstrap() -> sessionmaker:
+    """
+    Общая подготовка для всех сценариев (выполняется один раз на процесс).
+
+    :return: Фабрика сессий, которую переиспользуют все сценарии.
+    """
     logger.info("=" * 50)
     logger.info("Запуск приложения...")
     logger.info("=" * 50)
 
-    # Создаём engine и session factory
-    engine = get_engine()
-    SessionLocal = get_session_factory(engine)
+    # Настройки валидируются здесь, до первого обращения к БД: ошибка в .env
+    # всплывёт сразу при старте, а не посреди сценария
+    settings = get_settings()
+    logger.info("База данных: %s", settings.db_name)
+
+    # Фабрика сессий (engine и пул соединений создаются один раз на процесс)
+    SessionLocal = get_session_factory()
 
     # Создаём таблицы
     create_tables()
+    return SessionLocal
 
-    # Работаем с БД
-    logger.info("\n" + "=" * 50)
-    logger.info("Создание категорий")
-    logger.info("=" * 50)
 
-    # 1. Создаём категории
-    electronics = category_create(SessionLocal, CategoryCreate(name="Электроника"))
-    gadgets = category_create(SessionLocal, CategoryCreate(name="Гаджеты"))
-    food = category_create(SessionLocal, CategoryCreate(name="Еда"))
-
-    logger.info("\n" + "=" * 50)
-    logger.info("Создание тегов")
-    logger.info("=" * 50)
-
-    # 2. Создаём теги
-    new_tag = tag_create(SessionLocal, TagCreate(name="Новинка"))
-    sale_tag = tag_create(SessionLocal, TagCreate(name="Скидка"))
-    popular_tag = tag_create(SessionLocal, TagCreate(name="Популярное"))
-    premium_tag = tag_create(SessionLocal, TagCreate(name="Премиум"))
+def demo_relations():
+    """Заполнение БД категориями, тегами и продуктами со связями + вывод содержимого."""
+    SessionLocal = bootstrap()
 
+    # Работаем с БД
     logger.info("\n" + "=" * 50)
-    logger.info("Создание продуктов со связями")
+    logger.info("Заполнение БД: категории, теги и продукты со связями")
     logger.info("=" * 50)
 
-    # 3. Создаём продукты со связями
-    product1 = product_create(
+    # Всё создаётся одной транзакцией, связи указываются по имени
+    bulk_seed(
         SessionLocal,
-        ProductCreate(
-            name="Плюмбус",
-            description="Незаменимая вещь в каждом доме",
-            image_url="https://example.com/plumbus.jpg",
-            price_shmeckles=25.5,
-            price_flurbos=3.2,
-            category_id=electronics.id,
-            tag_ids=[new_tag.id, popular_tag.id],
-        ),
-    )
-
-    product2 = product_create(
-        SessionLocal,
-        ProductCreate(
-            name="Портальная пушка",
-            description="Открывает порталы между измерениями",
-            price_shmeckles=1000.0,
-            price_flurbos=150.0,
-            category_id=gadgets.id,
-            tag_ids=[new_tag.id, sale_tag.id, premium_tag.id],
-        ),
-    )
-
-    product3 = product_create(
-        SessionLocal,
-        ProductCreate(
-            name="Мега-семена",
-            description="Семена из измерения C-137",
-            price_shmeckles=50.0,
-            price_flurbos=7.5,
-            category_id=food.id,
-            tag_ids=[popular_tag.id],
-        ),
-    )
-
-    product4 = product_create(
-        SessionLocal,
-        ProductCreate(
-            name="Флиббо-джиббер",
-            description="Устройство для флиббования",
-            price_shmeckles=75.0,
-            price_flurbos=12.0,
-            # Без категории!
-            tag_ids=[premium_tag.id],
-        ),
+        categories=[
+            CategoryCreate(name="Электроника"),
+            CategoryCreate(name="Гаджеты"),
+            CategoryCreate(name="Еда"),
+        ],
+        tags=[
+            TagCreate(name="Новинка"),
+            TagCreate(name="Скидка"),
+            TagCreate(name="Популярное"),
+            TagCreate(name="Премиум"),
+        ],
+        products=[
+            ProductSeed(
+                name="Плюмбус",
+                description="Незаменимая вещь в каждом доме",
+                image_url="https://example.com/plumbus.jpg",
+                price_shmeckles=25.5,
+                price_flurbos=3.2,
+                category_name="Электроника",
+                tag_names=["Новинка", "Популярное"],
+            ),
+            ProductSeed(
+                name="Портальная пушка",
+                description="Открывает порталы между измерениями",
+                price_shmeckles=1000.0,
+                price_flurbos=150.0,
+                category_name="Гаджеты",
+                tag_names=["Новинка", "Скидка", "Премиум"],
+            ),
+            ProductSeed(
+                name="Мега-семена",
+                description="Семена из измерения C-137",
+                price_shmeckles=50.0,
+                price_flurbos=7.5,
+                category_name="Еда",
+                tag_names=["Популярное"],
+            ),
+            ProductSeed(
+                name="Флиббо-джиббер",
+                description="Устройство для флиббования",
+                price_shmeckles=75.0,
+                price_flurbos=12.0,
+                # Без категории!
+                tag_names=["Премиум"],
+            ),
+        ],
     )
 
     logger.info("\n" + "=" * 50)
     logger.info("Все категории в БД:")
     logger.info("=" * 50)
 
-    all_categories = category_get_all(SessionLocal)
-    for cat in all_categories:
-        logger.info(f"  • {cat.name} (ID: {cat.id})")
+    # Весь список - одним сообщением (один вызов логгера вместо N)
+    all_categories = category_get_all_orm(SessionLocal)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "%s", "\n".join(f"  • {cat.name} (ID: {cat.id})" for cat in all_categories)
+        )
 
     logger.info("\n" + "=" * 50)
     logger.info("Все теги в БД:")
     logger.info("=" * 50)
 
-    all_tags = tag_get_all(SessionLocal)
-    for tag in all_tags:
-        logger.info(f"  • {tag.name} (ID: {tag.id})")
+    all_tags = tag_get_all_orm(SessionLocal)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "%s", "\n".join(f"  • {tag.name} (ID: {tag.id})" for tag in all_tags)
+        )
 
     logger.info("\n" + "=" * 50)
     logger.info("Все продукты в БД:")
     logger.info("=" * 50)
 
-    # Получаем все продукты
-    all_products = product_get_all(SessionLocal)
-    for product in all_products:
+    # Получаем все продукты (ORM-объекты: для вывода Pydantic-схемы не нужны)
+    all_products = product_get_all_orm(SessionLocal)
+    # Категорию и теги форматируем только если сообщение попадёт в лог,
+    # весь список - одним сообщением
+    if logger.isEnabledFor(logging.INFO):
         logger.info(
-            f"\n📦 {product.name} ({product.price_shmeckles} шмеклей)\n"
-            f"   Категория: {product.category.name if product.category else '❌ Без категории'}\n"
-            f"   Теги: {', '.join(tag.name for tag in product.tags) if product.tags else '❌ Без тегов'}"
+            "%s",
+            "".join(
+                f"\n📦 {product.name} ({product.price_shmeckles} шмеклей)"
+                f"\n   Категория: "
+                f"{product.category.name if product.category else '❌ Без категории'}"
+                f"\n   Теги: "
+                f"{', '.join(tag.name for tag in product.tags) or '❌ Без тегов'}"
+                for product in all_products
+            ),
         )
 
+
+def demo_search():
+    """Расширенный поиск по названию, категории и тегам."""
+    SessionLocal = bootstrap()
+
     logger.info("\n" + "=" * 50)
     logger.info("Расширенный поиск по слову 'портал':")
     logger.info("=" * 50)
@@ -154,7 +179,7 @@ def main():
     # Поиск по названию, категории и тегам
     search_results = product_search_advanced(SessionLocal, "портал")
     for product in search_results:
-        logger.info(f"  ✅ Найдено: {product.name}")
+        logger.info("  ✅ Найдено: %s", product.name)
 
     logger.info("\n" + "=" * 50)
     logger.info("Поиск по слову 'новинка' (тег):")
@@ -162,7 +187,36 @@ def main():
 
     search_results = product_search_advanced(SessionLocal, "новинка")
     for product in search_results:
-        logger.info(f"  ✅ Найдено: {product.name}")
+        logger.info("  ✅ Найдено: %s", product.name)
+
+
+SCENARIOS = {
+    "demo_relations": demo_relations,
+    "demo_search": demo_search,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Демонстрация работы с БД")
+    parser.add_argument(
+        "scenario",
+        nargs="?",
+        choices=[*SCENARIOS, "all"],
+        default="all",
+        help="Сценарий для запуска (по умолчанию все)",
+    )
+    args = parser.parse_args()
+
+    scenarios = (
+        SCENARIOS.values() if args.scenario == "all" else [SCENARIOS[args.scenario]]
+    )
+    try:
+        for scenario in scenarios:
+            scenario()
+    except DatabaseOperationError as e:
+        # Ожидаемая ошибка: уже залогирована в CRUD функции, трейсбек не нужен
+        logger.error("❌ Сценарий прерван: %s", e)
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from sqlalchemy import Column, Table, String, Integer, Float, ForeignKey, Text, Index
+from sqlalchemy import column, table
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -19,6 +20,9 @@ product_tag_association = Table(
         Integer,
         ForeignKey("tags.id", ondelete="CASCADE"),
         primary_key=True,
+        # product_id покрыт составным PK (первый столбец), tag_id - нет:
+        # нужен для выборки продуктов по тегу и каскадного удаления тега
+        index=True,
     ),
 )
 
@@ -99,4 +103,20 @@ class Product(Base):
     # Составной индекс для частых запросов
     __table_args__ = (
         Index("ix_product_category_price", "category_id", "price_shmeckles"),
+        # Поиск по названию в пределах категории
+        Index("ix_product_name_category", "name", "category_id"),
     )
+
+
+# --- Полнотекстовый индекс продуктов (SQLite FTS5) ---
+# Виртуальная таблица не входит в Base.metadata: она создаётся вместе с
+# триггерами в utils/db_initial.create_search_index. rowid = products.id
+products_fts = table(
+    "products_fts",
+    column("rowid"),
+    column("name"),
+    column("description"),
+    column("category"),
+    column("tags"),
+    column("rank"),  # Скрытый столбец FTS5 для сортировки по релевантности
+)
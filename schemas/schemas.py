@@ -47,6 +47,20 @@ class ProductCreate(BaseModel):
     tag_ids: List[int] = []  # Список ID тегов
 
 
+class ProductSeed(BaseModel):
+    """
+    Продукт для начального заполнения БД (bulk_seed).
+    Категория и теги указываются по имени, т.к. их ID ещё неизвестны.
+    """
+    name: str
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    price_shmeckles: float
+    price_flurbos: float
+    category_name: Optional[str] = None
+    tag_names: List[str] = []  # Список имён тегов
+
+
 class ProductUpdate(ProductCreate):
     """
     Обновление продукта в формате PUT (все поля как в создании, но с ID обновленца)
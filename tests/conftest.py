@@ -0,0 +1,54 @@
+"""
+Общие фикстуры тестов.
+
+Каждый тест работает на своей БД в памяти (DB_NAME=":memory:"),
+заполненной через bulk_seed.
+"""
+
+import pytest
+
+from config import get_settings
+from schemas.schemas import CategoryCreate, ProductSeed, TagCreate
+from utils.db import _create_engine, _create_session_factory, get_session_factory
+from utils.db_initial import create_tables
+from utils.db_operations import bulk_seed
+
+
+def _clear_db_caches():
+    """Сбрасывает настройки, engine и фабрику сессий, закэшированные на процесс."""
+    get_settings.cache_clear()
+    _create_engine.cache_clear()
+    _create_session_factory.cache_clear()
+
+
+@pytest.fixture
+def session_local(monkeypatch):
+    """Фабрика сессий для новой БД в памяти с двумя продуктами."""
+    monkeypatch.setenv("DB_NAME", ":memory:")
+    _clear_db_caches()
+    create_tables()
+    SessionLocal = get_session_factory()
+    bulk_seed(
+        SessionLocal,
+        categories=[CategoryCreate(name="Гаджеты")],
+        tags=[TagCreate(name="Новинка"), TagCreate(name="Премиум")],
+        products=[
+            ProductSeed(
+                name="Портальная пушка",
+                description="Открывает порталы между измерениями",
+                price_shmeckles=1000.0,
+                price_flurbos=150.0,
+                category_name="Гаджеты",
+                tag_names=["Новинка", "Премиум"],
+            ),
+            ProductSeed(
+                name="Флиббо-джиббер",
+                description="Устройство для флиббования",
+                price_shmeckles=75.0,
+                price_flurbos=12.0,
+                tag_names=[],
+            ),
+        ],
+    )
+    yield SessionLocal
+    _clear_db_caches()
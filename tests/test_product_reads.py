@@ -0,0 +1,68 @@
+"""
+Чтение продуктов: загрузка связей категорий и тегов.
+
+Фикстура session_local (БД в памяти с тестовыми данными) - в conftest.py.
+"""
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from utils.db_operations import (
+    _GET_PRODUCT_BY_ID,
+    product_get_all_orm,
+    product_get_by_id,
+    readonly_session,
+)
+
+
+def test_product_get_by_id_loads_category_and_tags(session_local):
+    product = product_get_by_id(session_local, 1)
+
+    assert product.name == "Портальная пушка"
+    assert product.category.name == "Гаджеты"
+    assert [tag.name for tag in product.tags] == ["Новинка", "Премиум"]
+
+
+def test_product_get_by_id_without_relations(session_local):
+    product = product_get_by_id(session_local, 2)
+
+    assert product.category is None
+    assert product.tags == []
+
+
+def test_product_get_by_id_missing(session_local):
+    assert product_get_by_id(session_local, 999) is None
+
+
+def test_product_get_by_id_statement_raises_on_other_relations(session_local):
+    with readonly_session(session_local) as session:
+        product = session.execute(_GET_PRODUCT_BY_ID, {"pid": 1}).scalar_one()
+
+        assert product.category.name == "Гаджеты"
+        assert [tag.name for tag in product.tags] == ["Новинка", "Премиум"]
+        with pytest.raises(InvalidRequestError):
+            product.category.products
+        with pytest.raises(InvalidRequestError):
+            product.tags[0].products
+
+
+def test_product_get_all_orm_loads_category_and_tags(session_local):
+    products = product_get_all_orm(session_local)
+
+    assert [product.name for product in products] == [
+        "Портальная пушка",
+        "Флиббо-джиббер",
+    ]
+    assert products[0].category.name == "Гаджеты"
+    assert [tag.name for tag in products[0].tags] == ["Новинка", "Премиум"]
+    assert products[1].category is None
+    assert products[1].tags == []
+
+
+def test_product_get_all_orm_raises_on_other_relations(session_local):
+    product = product_get_all_orm(session_local)[0]
+
+    with pytest.raises(InvalidRequestError):
+        product.category.products
+    with pytest.raises(InvalidRequestError):
+        product.tags[0].products
@@ -0,0 +1,41 @@
+"""
+Поиск продуктов по полнотекстовому индексу products_fts.
+
+Фикстура session_local (БД в памяти с тестовыми данными) - в conftest.py.
+"""
+
+import pytest
+
+from utils.db_operations import product_like_name, product_search_advanced
+
+ALL_PRODUCTS = ["Портальная пушка", "Флиббо-джиббер"]
+
+
+@pytest.mark.parametrize("search", ["", "   "])
+def test_empty_search_returns_all_products(session_local, search):
+    assert [p.name for p in product_search_advanced(session_local, search)] == (
+        ALL_PRODUCTS
+    )
+    assert [p.name for p in product_like_name(session_local, search)] == ALL_PRODUCTS
+
+
+@pytest.mark.parametrize("search", ["!!!", "-", "%"])
+def test_search_without_words_returns_nothing(session_local, search):
+    assert product_search_advanced(session_local, search) == []
+    assert product_like_name(session_local, search) == []
+
+
+def test_search_advanced_matches_category_and_tags(session_local):
+    assert [p.name for p in product_search_advanced(session_local, "гаджеты")] == [
+        "Портальная пушка"
+    ]
+    assert [p.name for p in product_search_advanced(session_local, "премиум")] == [
+        "Портальная пушка"
+    ]
+
+
+def test_like_name_matches_word_prefix_in_name_only(session_local):
+    assert [p.name for p in product_like_name(session_local, "порт")] == [
+        "Портальная пушка"
+    ]
+    assert product_like_name(session_local, "гаджеты") == []
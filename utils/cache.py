@@ -0,0 +1,111 @@
+"""
+Простой кэш в памяти процесса с временем жизни записей (TTL).
+
+Используется для редко меняющихся справочных данных (категории, теги):
+чтения берут результат из кэша, изменяющие операции сбрасывают его
+после успешного commit.
+
+Пример:
+    _CACHE = TTLCache(ttl=60)
+
+    @_CACHE.cached
+    @with_readonly_session
+    def category_get_all(session): ...
+
+    @_CACHE.invalidates
+    @with_transaction
+    def category_create(session, data): ...
+
+Кэш живёт в памяти одного процесса: при нескольких процессах каждый
+держит свою копию, и запись в одном не сбрасывает кэш в остальных.
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """
+    Потокобезопасный кэш результатов функций с TTL и ограничением размера.
+
+    Ключ - функция и её аргументы (аргументы должны быть хэшируемыми).
+    Закэшированные объекты отдаются как есть - вызывающий код не должен их изменять.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        maxsize: int = 1024,
+        bypass: Callable[..., bool] | None = None,
+    ):
+        """
+        :param ttl: Время жизни записи в секундах
+        :param maxsize: Максимальное количество записей
+        :param bypass: Функция от аргументов вызова; если вернула True, функция
+            выполняется напрямую, без чтения и записи кэша
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.bypass = bypass
+        self._data: dict = {}
+        # Номер "поколения" кэша, увеличивается при каждом clear()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def cached(self, func: Callable[..., T]) -> Callable[..., T]:
+        """Декоратор: результат функции берётся из кэша, пока запись не устарела."""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> T:
+            if self.bypass is not None and self.bypass(*args, **kwargs):
+                return func(*args, **kwargs)
+
+            key = (func.__qualname__, args, frozenset(kwargs.items()))
+            now = time.monotonic()
+            with self._lock:
+                entry = self._data.get(key)
+                generation = self._generation
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+            result = func(*args, **kwargs)
+            with self._lock:
+                # Если пока func выполнялась, кэш сбросили (запись зафиксировала
+                # изменения), результат мог быть прочитан до commit - не сохраняем
+                if self._generation == generation:
+                    self._evict(now)
+                    self._data[key] = (now + self.ttl, result)
+            return result
+
+        return wrapper
+
+    def invalidates(self, func: Callable[..., T]) -> Callable[..., T]:
+        """Декоратор: после успешного выполнения функции кэш сбрасывается целиком."""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> T:
+            result = func(*args, **kwargs)
+            self.clear()
+            return result
+
+        return wrapper
+
+    def clear(self) -> None:
+        """Удаляет все записи и отменяет сохранение уже начатых чтений."""
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+    def _evict(self, now: float) -> None:
+        """Освобождает место под новую запись (вызывать под self._lock)."""
+        if len(self._data) < self.maxsize:
+            return
+        # Сначала устаревшие записи, затем самые старые по времени добавления
+        for key in [key for key, (expires, _) in self._data.items() if expires <= now]:
+            del self._data[key]
+        while len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
@@ -0,0 +1,134 @@
+# utils/db.py
+"""
+Подключение к базе данных: engine с пулом соединений и фабрика сессий.
+
+Оба объекта создаются один раз на процесс (lru_cache) при первом обращении,
+а не при импорте модуля. CRUD операции - в utils/db_operations.py.
+"""
+
+import logging
+from functools import lru_cache
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from config import get_settings
+
+# Создаём именованный логгер для этого модуля
+logger = logging.getLogger(__name__)
+
+
+def get_engine(db_name: str | None = None):
+    """
+    Возвращает движок базы данных.
+
+    Engine (и его пул соединений) создаётся один раз на процесс для каждого
+    имени БД: повторные вызовы возвращают уже созданный объект.
+    """
+    return _create_engine(db_name or get_settings().db_name)
+
+
+@lru_cache(maxsize=None)
+def _create_engine(db: str):
+    """Создает движок базы данных (кэшируется по имени БД).
+
+    Пул задаётся явно: QueuePool с размерами из настроек и pre_ping-проверкой
+    соединения перед выдачей, старые соединения пересоздаются через
+    db_pool_recycle секунд. check_same_thread=False нужен, чтобы соединения
+    SQLite можно было отдавать из пула в разные потоки.
+
+    query_cache_size - сколько скомпилированных запросов держит кэш engine:
+    все lambda_stmt и заранее собранные statement-константы CRUD модуля
+    (с разными опциями) должны помещаться в него, иначе LRU начнёт вытеснять
+    их и компилировать заново.
+
+    Для db=":memory:" вместо пула - StaticPool с одним соединением: иначе каждое
+    новое соединение видело бы свою пустую БД.
+
+    echo не передаётся: вывод SQL управляется уровнем логгера "sqlalchemy.engine"
+    (см. utils.logger.setup_logging).
+    """
+    settings = get_settings()
+    if db == ":memory:":
+        # У каждого соединения к :memory: своя отдельная пустая БД, поэтому
+        # все сессии должны работать через одно общее соединение
+        engine = create_engine(
+            "sqlite://",
+            poolclass=StaticPool,
+            query_cache_size=settings.db_query_cache_size,
+            connect_args={"check_same_thread": False},
+        )
+    else:
+        engine = create_engine(
+            f"sqlite:///{db}",
+            poolclass=QueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            query_cache_size=settings.db_query_cache_size,
+            connect_args={"check_same_thread": False},
+        )
+    event.listen(engine, "connect", _set_sqlite_pragma)
+    logger.info("Создан движок базы данных для %s", db)
+    return engine
+
+
+# PRAGMA для каждого нового соединения SQLite
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",  # Журнал упреждающей записи: читатели не ждут писателей
+    "synchronous=NORMAL",  # В режиме WAL безопасно и без fsync на каждый commit
+    "temp_store=MEMORY",  # Временные таблицы и индексы в памяти
+    "mmap_size=268435456",  # 256 МБ файла БД читаются через mmap
+    "cache_size=-65536",  # Кэш страниц 64 МБ (отрицательное значение - в КиБ)
+    "foreign_keys=ON",  # Включает ondelete="CASCADE" / "SET NULL" из моделей
+)
+
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """
+    Настраивает каждое новое соединение SQLite (см. SQLITE_PRAGMAS).
+
+    Вызывается один раз на физическое соединение: пул переиспользует соединения,
+    поэтому PRAGMA не выполняются повторно на каждый запрос.
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+def get_session_factory(engine=None):
+    """Возвращает фабрику сессий (одну на engine, по умолчанию get_engine()).
+    :param engine: Движок базы данных SQLAlchemy.
+    :return: Фабрика сессий SQLAlchemy.
+    """
+    return _create_session_factory(engine or get_engine())
+
+
+@lru_cache(maxsize=None)
+def _create_session_factory(engine):
+    """Создает фабрику сессий (кэшируется для каждого engine).
+    :param engine: Движок базы данных SQLAlchemy.
+    :return: Фабрика сессий SQLAlchemy.
+
+    bind - Движок базы данных, к которому будет привязана сессия.
+
+    autocommit - Если установлено в False, изменения не будут автоматически
+    зафиксированы в базе данных. Это позволяет явно контролировать транзакции.
+
+    autoflush - Если установлено в False, изменения не будут автоматически
+    отправлены в базу данных перед выполнением запросов. Это может быть полезно
+    в ситуациях, когда необходимо выполнить несколько операций с базой данных
+    в рамках одной транзакции.
+
+    expire_on_commit - Если установлено в False, объекты в сессии не будут
+    удалены из сессии после фиксации транзакции. Это позволяет повторно использовать объекты
+    после коммита без необходимости повторного запроса к базе данных.
+    """
+    logger.info("Создана фабрика сессий для базы данных.")
+    return sessionmaker(
+        bind=engine, autocommit=False, autoflush=False, expire_on_commit=False
+    )
@@ -3,18 +3,151 @@
 Модуль инициализации базы данных
 """
 from models.base import Base
-from utils.db_operations import get_engine
+from models.models import products_fts
+from utils.db import get_engine
 import logging
 
 # Создаём именованный логгер для этого модуля
 logger = logging.getLogger(__name__)
 
+# Версия схемы, записывается в PRAGMA user_version после create_tables().
+# Увеличить при изменении моделей или FTS_DDL: при несовпадении версии недостающие
+# таблицы и индексы создаются, а FTS-таблица и её триггеры пересоздаются заново
+SCHEMA_VERSION = 2
+
+# --- Полнотекстовый индекс продуктов (SQLite FTS5) ---
+#
+# products_fts хранит для каждого продукта (rowid = products.id) его название,
+# описание, имя категории и имена тегов. Поиск идёт по инвертированному индексу
+# вместо ILIKE '%...%' по трём таблицам. Индекс поддерживается триггерами;
+# удаление категорий/тегов доходит до него через FK-действия
+# (SET NULL на products, CASCADE на ассоциативной таблице), которые тоже вызывают триггеры.
+
+FTS_TABLE = products_fts.name
+
+
+def _fts_insert(product_filter: str) -> str:
+    """SQL для добавления в индекс продуктов, отобранных условием по алиасу `p`."""
+    return f"""
+        INSERT INTO {FTS_TABLE} (rowid, name, description, category, tags)
+        SELECT p.id, p.name, p.description, c.name,
+               (SELECT group_concat(t.name, ' ')
+                FROM product_tag_association a JOIN tags t ON t.id = a.tag_id
+                WHERE a.product_id = p.id)
+        FROM products p LEFT JOIN categories c ON c.id = p.category_id
+        WHERE {product_filter}"""
+
+
+def _fts_reindex(product_filter: str) -> str:
+    """Тело триггера: удалить и заново добавить строки индекса для продуктов."""
+    return f"""
+        DELETE FROM {FTS_TABLE}
+        WHERE rowid IN (SELECT p.id FROM products p WHERE {product_filter});
+        {_fts_insert(product_filter)};
+    """
+
+
+_PRODUCTS_WITH_TAG = (
+    "p.id IN (SELECT product_id FROM product_tag_association WHERE tag_id = NEW.id)"
+)
+
+FTS_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+    USING fts5(name, description, category, tags)
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products
+    BEGIN {_fts_reindex("p.id = NEW.id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_au
+    AFTER UPDATE OF name, description, category_id ON products
+    BEGIN {_fts_reindex("p.id = NEW.id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products
+    BEGIN DELETE FROM {FTS_TABLE} WHERE rowid = OLD.id; END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS categories_fts_au AFTER UPDATE OF name ON categories
+    WHEN OLD.name IS NOT NEW.name
+    BEGIN {_fts_reindex("p.category_id = NEW.id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tags_fts_au AFTER UPDATE OF name ON tags
+    WHEN OLD.name IS NOT NEW.name
+    BEGIN {_fts_reindex(_PRODUCTS_WITH_TAG)} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS product_tag_fts_ai AFTER INSERT ON product_tag_association
+    BEGIN {_fts_reindex("p.id = NEW.product_id")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS product_tag_fts_ad AFTER DELETE ON product_tag_association
+    BEGIN {_fts_reindex("p.id = OLD.product_id")} END
+    """,
+)
+
+
+# Триггеры из FTS_DDL (удаляются перед пересозданием индекса)
+FTS_TRIGGERS = (
+    "products_fts_ai",
+    "products_fts_au",
+    "products_fts_ad",
+    "categories_fts_au",
+    "tags_fts_au",
+    "product_tag_fts_ai",
+    "product_tag_fts_ad",
+)
+
+
+def create_search_index(connection):
+    """
+    Пересоздаёт FTS5-индекс продуктов с триггерами и заполняет его текущими данными.
+
+    Все statement в FTS_DDL - CREATE ... IF NOT EXISTS, поэтому старые триггеры
+    и таблица сначала удаляются: иначе изменённый FTS_DDL не применился бы
+    к уже существующей БД.
+
+    :param connection: Соединение SQLAlchemy (внутри транзакции).
+    """
+    for trigger in FTS_TRIGGERS:
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    for statement in FTS_DDL:
+        connection.exec_driver_sql(statement)
+
+    # Полная перестройка: индекс заполняется данными, которые уже есть в БД
+    connection.exec_driver_sql(_fts_insert("1 = 1"))
+    logger.info("🔍 Полнотекстовый индекс продуктов готов")
+
 
 def create_tables():
-    """Создаёт все таблицы в БД на основе моделей."""
-    logger.info("Начало создания таблиц...")
+    """
+    Создаёт все таблицы в БД на основе моделей (и полнотекстовый индекс).
+
+    Если PRAGMA user_version уже равна SCHEMA_VERSION, схема считается актуальной
+    и create_all (с проверкой каждой таблицы) не запускается.
+
+    create_all не трогает уже существующие таблицы, поэтому индексы, добавленные
+    в модели позже, создаются отдельно (checkfirst - только отсутствующие).
+    """
     engine = get_engine()
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        version = connection.exec_driver_sql("PRAGMA user_version").scalar()
+        if version == SCHEMA_VERSION:
+            logger.info("✅ Схема БД актуальна (версия %s)", version)
+            return
+
+        logger.info("Начало создания таблиц (версия схемы %s)...", SCHEMA_VERSION)
+        Base.metadata.create_all(bind=connection)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+        create_search_index(connection)
+        connection.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
     logger.info("✅ Таблицы успешно созданы!")
 
 
@@ -22,5 +155,9 @@ def drop_tables():
     """Удаляет все таблицы из БД. ОСТОРОЖНО: удалит все данные!"""
     logger.warning("⚠️ Запрос на удаление ВСЕХ таблиц!")
     engine = get_engine()
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
     Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA user_version = 0")
     logger.info("🗑️ Таблицы удалены!")
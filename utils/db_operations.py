@@ -5,10 +5,19 @@
 Архитектура и принципы:
 -----------------------
 1. **Управление транзакциями**: Используется декоратор @with_transaction для автоматического
-   управления транзакциями (commit при успехе, rollback при ошибках).
-
-2. **Загрузка связей**: Все функции работы с Product используют явную загрузку связей
-   через selectinload() для избежания проблем с lazy="raise_on_sql".
+   управления транзакциями (commit при успехе, rollback при ошибках). Для нескольких
+   операций в одной транзакции - контекстный менеджер transactional().
+
+2. **Загрузка связей**: Списки продуктов (product_get_all, products_iter,
+   product_like_name, product_search_advanced) читаются плоскими строками Core:
+   столбцы продукта и категория через LEFT JOIN в одном SELECT, теги - одним
+   сопутствующим запросом к ассоциативной таблице на всю страницу (пачку).
+   DTO собираются в _products_from_rows через model_construct, ORM-объекты
+   не создаются.
+   Функции, работающие с ORM (product_get_by_id, product_get_all_orm), загружают
+   связи явно из-за lazy="raise_on_sql": категория - через joinedload() в том же
+   SELECT, теги - через selectinload(), а raiseload("*") превращает обращение
+   к любой другой связи в ошибку вместо скрытого N+1.
 
 3. **Валидация данных**: Строгая проверка существования связанных сущностей (категории, теги)
    перед выполнением операций.
@@ -21,11 +30,20 @@
 
 5. **Типизация**: Полная поддержка type hints для IDE и статических анализаторов.
 
+Engine и фабрика сессий создаются в utils/db.py (get_engine, get_session_factory
+реэкспортируются здесь для старого кода).
+
 Структура CRUD операций:
 -------------------------
-- **Product**: Create, Read (by id/all), Update, Delete, Search (advanced/like)
+- **Product**: Create (одиночный/пачкой), Read (by id/all/потоково), Update, Delete,
+  Search (advanced/like)
 - **Category**: Create, Read (by id/all), Update, Delete
 - **Tag**: Create, Read (by id/all), Update, Delete
+- Чтения категорий и тегов (*_get_by_id, *_get_all) кэшируются на 60 секунд
+  (utils.cache.TTLCache), кэш сбрасывается их create/update/delete и bulk_seed
+- Варианты *_get_all_orm возвращают ORM-объекты без Pydantic-валидации
+  (для внутреннего кода; на границе API - Pydantic-схемы)
+- **Seed**: bulk_seed - категории, теги и продукты одной транзакцией
 
 Особенности работы со связями:
 -------------------------------
@@ -38,13 +56,41 @@
 который гарантирует:
 - Автоматический commit при успешном выполнении
 - Автоматический rollback при любых исключениях
-- Детальное логирование ошибок с трейсбеком
+- Детальное логирование неожиданных ошибок с трейсбеком
+- Ожидаемые ошибки (NotFoundError, AlreadyExistsError из utils.exceptions)
+  логируются одной строкой, без трейсбека
+
+Операции только на чтение (Read, Search) используют декоратор @with_readonly_session:
+сессия работает в режиме AUTOCOMMIT, без BEGIN/ROLLBACK вокруг каждого SELECT.
 """
 
-from sqlalchemy import create_engine, select, or_
-from sqlalchemy.orm import sessionmaker, selectinload, Session
-from models.models import Product as ProductORM, Category as CategoryORM, Tag as TagORM
-from config import settings
+from sqlalchemy import (
+    bindparam,
+    delete,
+    func,
+    insert,
+    lambda_stmt,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker, joinedload, raiseload, selectinload, Session
+from models.models import (
+    Product as ProductORM,
+    Category as CategoryORM,
+    Tag as TagORM,
+    product_tag_association,
+    products_fts,
+)
+from utils.cache import TTLCache
+from utils.db import get_engine, get_session_factory  # noqa: F401 (реэкспорт)
+from utils.exceptions import (
+    AlreadyExistsError,
+    DatabaseOperationError,
+    NotFoundError,
+)
 from schemas.schemas import (
     ProductCreate,
     Product,
@@ -53,27 +99,224 @@ from schemas.schemas import (
     TagCreate,
     Tag,
     ProductUpdate,
+    ProductSeed,
 )
+from pydantic import TypeAdapter
 import logging
+import re
+from contextlib import contextmanager
 from functools import wraps
-from typing import TypeVar, Callable
+from typing import TypeVar, Callable, Iterator
 
 # Создаём именованный логгер для этого модуля
 logger = logging.getLogger(__name__)
 
+# Адаптеры для валидации списков целиком (одним вызовом pydantic-core,
+# без повторного поиска схемы для каждого элемента)
+_CATEGORY_LIST = TypeAdapter(list[Category])
+_TAG_LIST = TypeAdapter(list[Tag])
+
+# Простые поля продукта (столбцы products без id и связей), общие для
+# ProductCreate / ProductUpdate / ProductSeed. Словарь из них собирается
+# getattr-ом по готовому кортежу, без model_dump(exclude=...) на каждый продукт
+_PRODUCT_CORE_FIELDS = tuple(
+    field
+    for field in ProductCreate.model_fields
+    if field not in {"category_id", "tag_ids"}
+)
+
+
+def _called_with_session(*args, **kwargs) -> bool:
+    """Первый аргумент - открытая Session вызывающего кода, а не фабрика сессий."""
+    return bool(args) and isinstance(args[0], Session)
+
+
+# Кэш справочных данных: *_get_by_id / *_get_all для категорий и тегов.
+# Сбрасывается после commit любой операции, изменяющей категории (теги).
+# Вызовы с открытой Session (см. readonly_session) идут мимо кэша: сессия
+# попала бы в ключ, а её незафиксированные изменения - в общий кэш
+_CATEGORY_CACHE = TTLCache(ttl=60, bypass=_called_with_session)
+_TAG_CACHE = TTLCache(ttl=60, bypass=_called_with_session)
+
+# Размер пачки при потоковом чтении больших выборок (yield_per)
+_YIELD_PER = 500
+
+# Продукт по ID со связями. lambda_stmt кэширует построенный и скомпилированный
+# запрос, при вызове меняется только параметр :pid
+_GET_PRODUCT_BY_ID = lambda_stmt(
+    lambda: select(ProductORM)
+    .where(ProductORM.id == bindparam("pid"))
+    .options(
+        joinedload(ProductORM.category),
+        selectinload(ProductORM.tags),
+        raiseload("*"),
+    )
+)
+
+# Запросы с фиксированной формой строятся один раз при импорте модуля,
+# при вызове передаются только значения параметров
+_GET_ALL_CATEGORIES = select(CategoryORM)
+_GET_ALL_TAGS = select(TagORM)
+
+# Создание категории/тега: INSERT ... ON CONFLICT(name) DO NOTHING RETURNING,
+# при конфликте существующая строка читается по имени (:name)
+_INSERT_CATEGORY = (
+    sqlite_insert(CategoryORM)
+    .values(name=bindparam("name"))
+    .on_conflict_do_nothing(index_elements=[CategoryORM.name])
+    .returning(CategoryORM.id, CategoryORM.name)
+)
+_GET_CATEGORY_BY_NAME = select(CategoryORM.id, CategoryORM.name).where(
+    CategoryORM.name == bindparam("name")
+)
+_INSERT_TAG = (
+    sqlite_insert(TagORM)
+    .values(name=bindparam("name"))
+    .on_conflict_do_nothing(index_elements=[TagORM.name])
+    .returning(TagORM.id, TagORM.name)
+)
+_GET_TAG_BY_NAME = select(TagORM.id, TagORM.name).where(
+    TagORM.name == bindparam("name")
+)
+
+# Выборки по списку значений: один expanding-параметр (:ids / :names),
+# список любой длины подставляется при выполнении
+_GET_CATEGORIES_BY_IDS = select(CategoryORM.id, CategoryORM.name).where(
+    CategoryORM.id.in_(bindparam("ids", expanding=True))
+)
+_GET_TAGS_BY_IDS = select(TagORM.id, TagORM.name).where(
+    TagORM.id.in_(bindparam("ids", expanding=True))
+)
+_GET_CATEGORIES_BY_NAMES = select(CategoryORM).where(
+    CategoryORM.name.in_(bindparam("names", expanding=True))
+)
+_GET_TAGS_BY_NAMES = select(TagORM).where(
+    TagORM.name.in_(bindparam("names", expanding=True))
+)
+# Теги продуктов (:ids - ID продуктов) прямо из ассоциативной таблицы
+_GET_TAGS_BY_PRODUCT_IDS = (
+    select(product_tag_association.c.product_id, TagORM.id, TagORM.name)
+    .join(TagORM, TagORM.id == product_tag_association.c.tag_id)
+    .where(product_tag_association.c.product_id.in_(bindparam("ids", expanding=True)))
+    .order_by(product_tag_association.c.product_id, TagORM.id)
+)
+
+# Удаление по ID (:id) одним DELETE ... RETURNING id
+_DELETE_PRODUCT = (
+    delete(ProductORM).where(ProductORM.id == bindparam("id")).returning(ProductORM.id)
+)
+_DELETE_CATEGORY = (
+    delete(CategoryORM)
+    .where(CategoryORM.id == bindparam("id"))
+    .returning(CategoryORM.id)
+)
+_DELETE_TAG = delete(TagORM).where(TagORM.id == bindparam("id")).returning(TagORM.id)
+_COUNT_CATEGORY_PRODUCTS = (
+    select(func.count())
+    .select_from(ProductORM)
+    .where(ProductORM.category_id == bindparam("id"))
+)
+_COUNT_TAG_PRODUCTS = (
+    select(func.count())
+    .select_from(product_tag_association)
+    .where(product_tag_association.c.tag_id == bindparam("id"))
+)
+# Проверка существования продукта (:id) без загрузки строки
+_PRODUCT_EXISTS = select(literal_column("1")).where(ProductORM.id == bindparam("id"))
+_DELETE_PRODUCT_TAGS = delete(product_tag_association).where(
+    product_tag_association.c.product_id == bindparam("id")
+)
+
+# Страница продуктов с категориями и тегами (общая для DTO и ORM вариантов)
+_GET_PRODUCTS_PAGE = (
+    select(ProductORM)
+    .options(
+        joinedload(ProductORM.category),
+        selectinload(ProductORM.tags),
+        raiseload("*"),
+    )
+    # Порядок нужен для стабильной пагинации, как в _GET_PRODUCT_ROWS_PAGE
+    .order_by(ProductORM.id)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+    .execution_options(yield_per=_YIELD_PER)
+)
+
+# Продукты плоскими строками Core (без ORM-объектов): столбцы продукта
+# и категория через LEFT JOIN; теги догружаются отдельным запросом (_products_from_rows)
+_PRODUCT_ROWS = select(
+    ProductORM.id,
+    ProductORM.name,
+    ProductORM.description,
+    ProductORM.image_url,
+    ProductORM.price_shmeckles,
+    ProductORM.price_flurbos,
+    CategoryORM.id.label("category_id"),
+    CategoryORM.name.label("category_name"),
+).outerjoin(CategoryORM, ProductORM.category_id == CategoryORM.id)
+_GET_PRODUCT_ROWS_PAGE = (
+    _PRODUCT_ROWS.order_by(ProductORM.id)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+# Страница результатов полнотекстового поиска (:q - FTS5-запрос), по релевантности
+_SEARCH_PRODUCT_ROWS_PAGE = (
+    _PRODUCT_ROWS.join(products_fts, products_fts.c.rowid == ProductORM.id)
+    .where(literal_column(products_fts.name).match(bindparam("q")))
+    .order_by(products_fts.c.rank)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+# Все продукты по порядку ID, для потокового чтения (products_iter)
+_GET_ALL_PRODUCT_ROWS = _PRODUCT_ROWS.order_by(ProductORM.id)
+
 # Type variables для декоратора
 T = TypeVar("T")
 
 
+@contextmanager
+def transactional(session_local: sessionmaker) -> Iterator[Session]:
+    """
+    Контекстный менеджер транзакции SQLAlchemy.
+
+    - Создаёт сессию из session_local
+    - Выполняет commit() при успешном выходе из блока
+    - Выполняет rollback() и пробрасывает исключение дальше при ошибке
+
+    Логирование ошибок остаётся за вызывающим кодом: ожидаемые
+    доменные ошибки (utils.exceptions) логируются без трейсбека.
+
+    Использование:
+    --------------
+    with transactional(SessionLocal) as session:
+        session.add(obj)
+        # commit произойдёт автоматически
+
+    :param session_local: Фабрика сессий
+    :return: Сессия внутри открытой транзакции
+    """
+    with session_local() as session:
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+
 def with_transaction(func: Callable[..., T]) -> Callable[..., T]:
     """
     Декоратор для автоматической обработки транзакций SQLAlchemy.
 
-    Оборачивает функцию в транзакцию с автоматическим управлением:
+    Тонкая обёртка над transactional() для CRUD функций:
     - Создаёт сессию из session_local (первый аргумент функции)
     - Автоматически выполняет commit() при успешном завершении
     - Автоматически выполняет rollback() при любых исключениях
-    - Логирует ошибки с полным трейсбеком
+    - Логирует неожиданные ошибки с полным трейсбеком; доменные ошибки
+      (DatabaseOperationError) уже залогированы в месте возникновения
+      и пробрасываются без трейсбека
 
     Использование:
     --------------
@@ -93,113 +336,139 @@ def with_transaction(func: Callable[..., T]) -> Callable[..., T]:
 
     @wraps(func)
     def wrapper(session_local: sessionmaker, *args, **kwargs) -> T:
-        with session_local() as session:
-            try:
+        try:
+            with transactional(session_local) as session:
                 # Вызываем функцию, передавая session вместо session_local
-                result = func(session, *args, **kwargs)
-                session.commit()
-                return result
-            except Exception as e:
-                session.rollback()
-                logger.error(f"❌ Ошибка в {func.__name__}: {e}", exc_info=True)
-                raise
+                return func(session, *args, **kwargs)
+        except DatabaseOperationError:
+            raise
+        except Exception as e:
+            logger.error("❌ Ошибка в %s: %s", func.__name__, e, exc_info=True)
+            raise
 
     return wrapper
 
 
-def get_engine(db_name=None):
-    """Создает и возвращает движок базы данных."""
-    db = db_name or settings.db_name
-    engine = create_engine(f"sqlite:///{db}", echo=settings.db_echo)
-    logger.info(f"Создан движок базы данных для {db}")
-    return engine
+@contextmanager
+def readonly_session(session_local: sessionmaker | Session) -> Iterator[Session]:
+    """
+    Контекстный менеджер сессии только на чтение.
 
+    Соединение сессии переводится в режим AUTOCOMMIT: SELECT выполняются
+    без BEGIN/COMMIT (ROLLBACK) вокруг каждого чтения. Сессия закрывается
+    при выходе из блока.
 
-def get_session_factory(engine):
-    """Создает и возвращает фабрику сессий.
-    :param engine: Движок базы данных SQLAlchemy.
-    :return: Фабрика сессий SQLAlchemy.
+    Если вместо фабрики передана уже открытая Session, она используется как есть
+    (без AUTOCOMMIT и без закрытия): серия чтений подряд идёт через одну сессию
+    и одно соединение из пула, а не открывает новую сессию на каждый вызов.
 
-    bind - Движок базы данных, к которому будет привязана сессия.
+    Нужен напрямую в генераторах (products_iter): декоратор закрыл бы сессию
+    раньше, чем начнётся итерация.
 
-    autocommit - Если установлено в False, изменения не будут автоматически
-    зафиксированы в базе данных. Это позволяет явно контролировать транзакции.
+    Использование:
+    --------------
+    with readonly_session(SessionLocal) as session:
+        products = [product_get_by_id(session, pid) for pid in ids]
+
+    :param session_local: Фабрика сессий или открытая сессия
+    :return: Сессия для чтения
+    """
+    if isinstance(session_local, Session):
+        # Сессией владеет вызывающий код: он её и закроет
+        yield session_local
+        return
+
+    with session_local() as session:
+        session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+        yield session
 
-    autoflush - Если установлено в False, изменения не будут автоматически
-    отправлены в базу данных перед выполнением запросов. Это может быть полезно
-    в ситуациях, когда необходимо выполнить несколько операций с базой данных
-    в рамках одной транзакции.
 
-    expire_on_commit - Если установлено в False, объекты в сессии не будут
-    удалены из сессии после фиксации транзакции. Это позволяет повторно использовать объекты
-    после коммита без необходимости повторного запроса к базе данных.
+def with_readonly_session(func: Callable[..., T]) -> Callable[..., T]:
     """
-    logger.info("Создана фабрика сессий для базы данных.")
-    return sessionmaker(
-        bind=engine, autocommit=False, autoflush=False, expire_on_commit=False
-    )
+    Декоратор для операций только на чтение.
+
+    Аналог @with_transaction без commit(), обёртка над readonly_session():
+    - Создаёт сессию из session_local (первый аргумент функции)
+    - Переводит соединение сессии в режим AUTOCOMMIT: SELECT выполняются
+      без BEGIN/COMMIT (ROLLBACK) вокруг каждого чтения
+    - Закрывает сессию после выполнения функции
+    - Если первым аргументом передана открытая Session, работает в ней
+      (см. readonly_session)
+
+    Использование такое же, как у @with_transaction:
+    --------------
+    @with_readonly_session
+    def my_read_function(session: Session, arg1):
+        return session.get(Model, arg1)
+
+    my_read_function(SessionLocal, value1)
+
+    :param func: Функция для оборачивания
+    :return: Обёрнутая функция с read-only сессией
+    """
+
+    @wraps(func)
+    def wrapper(session_local: sessionmaker | Session, *args, **kwargs) -> T:
+        with readonly_session(session_local) as session:
+            return func(session, *args, **kwargs)
+
+    return wrapper
 
 
 @with_transaction
 def product_delete_by_id(session: Session, product_id: int) -> int:
     """
-    Удаляет продукт по ID с явной загрузкой связей.
+    Удаляет продукт по ID одним DELETE-запросом.
 
     :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param product_id: ID продукта для удаления.
     :return: ID удалённого продукта или -1 при ошибке
 
     Особенности:
-    - Загружает категорию и теги перед удалением (требуется из-за lazy="raise_on_sql")
+    - Продукт не загружается в сессию: один DELETE ... RETURNING id
+      (вернувшаяся строка показывает, был ли продукт удалён)
     - M2M связи с тегами удаляются автоматически благодаря CASCADE
     - O2M связь с категорией обработана через ondelete="SET NULL"
     """
-    # Загружаем продукт со всеми связями
-    stmt = (
-        select(ProductORM)
-        .where(ProductORM.id == product_id)
-        .options(selectinload(ProductORM.category), selectinload(ProductORM.tags))
+    deleted_id = session.scalar(
+        _DELETE_PRODUCT,
+        {"id": product_id},
+        execution_options={"synchronize_session": False},
     )
+    # Commit выполнится автоматически декоратором
 
-    product = session.execute(stmt).scalar_one_or_none()
-
-    if not product:
-        logger.warning(f"❌ Продукт с ID={product_id} не найден для удаления.")
+    if deleted_id is None:
+        logger.warning("❌ Продукт с ID=%s не найден для удаления.", product_id)
         return -1
 
-    # Явно очищаем M2M связь (опционально, CASCADE делает это автоматически)
-    product.tags.clear()
-
-    session.delete(product)
-    # Commit выполнится автоматически декоратором
-
-    logger.info(
-        f"✅ Продукт '{product.name}' (ID={product_id}) успешно удалён. "
-        f"Категория: {product.category.name if product.category else 'Нет'}"
-    )
+    logger.info("✅ Продукт ID=%s успешно удалён.", product_id)
     return product_id
 
 
+@with_readonly_session
 def product_like_name(
-    session_local: sessionmaker, name_substring: str
+    session: Session, name_substring: str, skip: int = 0, limit: int = 100
 ) -> list[Product]:
     """
     Получает продукты по подстроке в названии.
-    :param session_local: Фабрика сессий SQLAlchemy.
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param name_substring: Подстрока для поиска в названии продукта.
+    :param skip: Количество записей для пропуска (пагинация)
+    :param limit: Максимальное количество записей (пагинация)
     :return: Список ProductRead, соответствующих критерию поиска.
-    """
-    with session_local() as session:
-        # Создаем statement (инструкцию) для запроса продуктов по подстроке в названии
-        stmt = select(ProductORM).where(ProductORM.name.ilike(f"%{name_substring}%"))
-        # Выполняем запрос и получаем все объекты Product
-        products = session.scalars(stmt).all()
 
-        result = [Product.model_validate(p) for p in products]
-        logger.info(
-            f"✅ Найдено {len(result)} продуктов, содержащих '{name_substring}' в названии."
-        )
-        return result
+    Поиск идёт по столбцу name индекса products_fts вместо ILIKE '%...%'
+    (полный просмотр таблицы). Совпадение - по началу слов: "порт" найдёт
+    "Портальная пушка", а "тальн" - нет. Пустая строка (или только пробелы)
+    возвращает все продукты, строка без слов (например "!!!") - пустой список.
+    """
+    result = _search_products(session, name_substring, skip, limit, column="name")
+    logger.info(
+        "✅ Найдено %s продуктов, содержащих '%s' в названии.",
+        len(result),
+        name_substring,
+    )
+    return result
 
 
 # ============================================
@@ -207,6 +476,7 @@ def product_like_name(
 # ============================================
 
 
+@_CATEGORY_CACHE.invalidates
 @with_transaction
 def category_create(session: Session, category_data: CategoryCreate) -> Category:
     """
@@ -216,53 +486,55 @@ def category_create(session: Session, category_data: CategoryCreate) -> Category
     :param category_data: Данные для создания категории
     :return: Category с id и name категории
     """
-    # Проверка на уникальность имени
-    existing = session.execute(
-        select(CategoryORM).where(CategoryORM.name == category_data.name)
-    ).scalar_one_or_none()
-
-    if existing:
-        logger.warning(f"⚠️ Категория '{category_data.name}' уже существует")
+    # INSERT ... ON CONFLICT(name) DO NOTHING RETURNING: новое имя - один запрос,
+    # без предварительного SELECT и без гонки между проверкой и вставкой
+    params = {"name": category_data.name}
+    created = session.execute(_INSERT_CATEGORY, params).one_or_none()
+
+    if created is None:
+        logger.warning("⚠️ Категория '%s' уже существует", category_data.name)
+        existing = session.execute(_GET_CATEGORY_BY_NAME, params).one()
         return Category.model_validate(existing)
 
-    # Создаём новую категорию
-    new_category = CategoryORM(name=category_data.name)
-
-    session.add(new_category)
-    session.flush()
-    session.refresh(new_category)
-
-    result = Category.model_validate(new_category)
-    logger.info(f"✅ Категория создана: ID={result.id}, Name={result.name}")
+    result = Category.model_validate(created)
+    logger.info("✅ Категория создана: ID=%s, Name=%s", result.id, result.name)
     return result
 
 
-def category_get_by_id(
-    session_local: sessionmaker, category_id: int
-) -> Category | None:
+@_CATEGORY_CACHE.cached
+@with_readonly_session
+def category_get_by_id(session: Session, category_id: int) -> Category | None:
     """Получить категорию по ID"""
-    with session_local() as session:
-        category = session.get(CategoryORM, category_id)
-        if not category:
-            logger.warning(f"❌ Категория с ID={category_id} не найдена.")
-            return None
+    category = session.get(CategoryORM, category_id)
+    if not category:
+        logger.warning("❌ Категория с ID=%s не найдена.", category_id)
+        return None
 
-        result = Category.model_validate(category)
-        logger.info(f"✅ Категория с ID={category_id} успешно получена.")
-        return result
+    result = Category.model_validate(category)
+    logger.info("✅ Категория с ID=%s успешно получена.", category_id)
+    return result
 
 
-def category_get_all(session_local: sessionmaker) -> list[Category]:
+@_CATEGORY_CACHE.cached
+@with_readonly_session
+def category_get_all(session: Session) -> list[Category]:
     """Получить все категории"""
-    with session_local() as session:
-        stmt = select(CategoryORM)
-        categories = session.scalars(stmt).all()
+    categories = session.scalars(_GET_ALL_CATEGORIES).all()
 
-        result = [Category.model_validate(cat) for cat in categories]
-        logger.info(f"✅ Получено {len(result)} категорий из базы данных.")
-        return result
+    result = _CATEGORY_LIST.validate_python(categories, from_attributes=True)
+    logger.info("✅ Получено %s категорий из базы данных.", len(result))
+    return result
 
 
+@with_readonly_session
+def category_get_all_orm(session: Session) -> list[CategoryORM]:
+    """Получить все категории как ORM-объекты (без Pydantic, отсоединённые от сессии)"""
+    categories = session.scalars(_GET_ALL_CATEGORIES).all()
+    logger.info("✅ Получено %s категорий (ORM) из базы данных.", len(categories))
+    return list(categories)
+
+
+@_CATEGORY_CACHE.invalidates
 @with_transaction
 def category_update(session: Session, category_id: int, name: str) -> Category:
     """
@@ -272,28 +544,32 @@ def category_update(session: Session, category_id: int, name: str) -> Category:
     :param category_id: ID категории для обновления.
     :param name: Новое имя категории.
     :return: Category с обновлёнными данными
-    :raises ValueError: Если категория не найдена
+    :raises NotFoundError: Если категория не найдена
+    :raises AlreadyExistsError: Если имя уже занято другой категорией
     """
     category = session.get(CategoryORM, category_id)
 
     if not category:
         error_msg = f"Категория с ID={category_id} не найдена"
-        logger.error(f"❌ {error_msg}")
-        raise ValueError(error_msg)
+        logger.error("❌ %s", error_msg)
+        raise NotFoundError(error_msg)
 
     # Обновляем имя
     category.name = name
-    # flush - фиксируем изменения в сессии
-    session.flush()
-
-    # refresh - обновляем объект из базы данных
-    session.refresh(category)
+    # flush - фиксируем изменения в сессии (refresh не нужен: объект уже актуален)
+    try:
+        session.flush()
+    except IntegrityError as e:
+        error_msg = f"Категория с именем '{name}' уже существует"
+        logger.error("❌ %s", error_msg)
+        raise AlreadyExistsError(error_msg) from e
 
     result = Category.model_validate(category)
-    logger.info(f"✅ Категория обновлена: ID={category_id}, Name={name}")
+    logger.info("✅ Категория обновлена: ID=%s, Name=%s", category_id, name)
     return result
 
 
+@_CATEGORY_CACHE.invalidates
 @with_transaction
 def category_delete(session: Session, category_id: int) -> int:
     """
@@ -305,28 +581,33 @@ def category_delete(session: Session, category_id: int) -> int:
 
     ⚠️ ВАЖНО: При ondelete="SET NULL" продукты останутся, но потеряют категорию!
     """
-    # Проверяем наличие связанных продуктов
-    stmt = select(ProductORM).where(ProductORM.category_id == category_id)
-    products = session.execute(stmt).scalars().all()
-    products_count = len(products)
+    # Проверяем наличие связанных продуктов (COUNT(*) без загрузки строк)
+    products_count = session.scalar(_COUNT_CATEGORY_PRODUCTS, {"id": category_id})
 
     if products_count > 0:
         logger.warning(
-            f"⚠️ У категории {category_id} есть {products_count} продуктов. "
-            f"Они станут без категории (category_id = NULL)."
+            "⚠️ У категории %s есть %s продуктов. "
+            "Они станут без категории (category_id = NULL).",
+            category_id,
+            products_count,
         )
 
-    category = session.get(CategoryORM, category_id)
-    if not category:
-        logger.warning(f"❌ Категория с ID={category_id} не найдена")
+    # Один DELETE ... RETURNING вместо SELECT + DELETE, category_id у продуктов
+    # обнуляет сама БД (ondelete="SET NULL")
+    deleted_id = session.scalar(
+        _DELETE_CATEGORY,
+        {"id": category_id},
+        execution_options={"synchronize_session": False},
+    )
+    if deleted_id is None:
+        logger.warning("❌ Категория с ID=%s не найдена", category_id)
         return -1
-
-    session.delete(category)
     # Commit выполнится автоматически декоратором
 
     logger.info(
-        f"✅ Категория ID={category_id} удалена. "
-        f"Продуктов осталось без категории: {products_count}"
+        "✅ Категория ID=%s удалена. Продуктов осталось без категории: %s",
+        category_id,
+        products_count,
     )
     return category_id
 
@@ -336,6 +617,7 @@ def category_delete(session: Session, category_id: int) -> int:
 # ============================================
 
 
+@_TAG_CACHE.invalidates
 @with_transaction
 def tag_create(session: Session, tag_data: TagCreate) -> Tag:
     """
@@ -345,51 +627,54 @@ def tag_create(session: Session, tag_data: TagCreate) -> Tag:
     :param tag_data: Данные для создания тега
     :return: Tag с id и name тега
     """
-    # Проверка на уникальность имени
-    existing = session.execute(
-        select(TagORM).where(TagORM.name == tag_data.name)
-    ).scalar_one_or_none()
+    # INSERT ... ON CONFLICT(name) DO NOTHING RETURNING (см. category_create)
+    params = {"name": tag_data.name}
+    created = session.execute(_INSERT_TAG, params).one_or_none()
 
-    if existing:
-        logger.warning(f"⚠️ Тег '{tag_data.name}' уже существует")
+    if created is None:
+        logger.warning("⚠️ Тег '%s' уже существует", tag_data.name)
+        existing = session.execute(_GET_TAG_BY_NAME, params).one()
         return Tag.model_validate(existing)
 
-    # Создаём новый тег
-    new_tag = TagORM(name=tag_data.name)
-
-    session.add(new_tag)
-    session.flush()
-    session.refresh(new_tag)
-
-    result = Tag.model_validate(new_tag)
-    logger.info(f"✅ Тег создан: ID={result.id}, Name={result.name}")
+    result = Tag.model_validate(created)
+    logger.info("✅ Тег создан: ID=%s, Name=%s", result.id, result.name)
     return result
 
 
-def tag_get_by_id(session_local: sessionmaker, tag_id: int) -> Tag | None:
+@_TAG_CACHE.cached
+@with_readonly_session
+def tag_get_by_id(session: Session, tag_id: int) -> Tag | None:
     """Получить тег по ID"""
-    with session_local() as session:
-        tag = session.get(TagORM, tag_id)
-        if not tag:
-            logger.warning(f"❌ Тег с ID={tag_id} не найден.")
-            return None
+    tag = session.get(TagORM, tag_id)
+    if not tag:
+        logger.warning("❌ Тег с ID=%s не найден.", tag_id)
+        return None
 
-        result = Tag.model_validate(tag)
-        logger.info(f"✅ Тег с ID={tag_id} успешно получен.")
-        return result
+    result = Tag.model_validate(tag)
+    logger.info("✅ Тег с ID=%s успешно получен.", tag_id)
+    return result
 
 
-def tag_get_all(session_local: sessionmaker) -> list[Tag]:
+@_TAG_CACHE.cached
+@with_readonly_session
+def tag_get_all(session: Session) -> list[Tag]:
     """Получить все теги"""
-    with session_local() as session:
-        stmt = select(TagORM)
-        tags = session.scalars(stmt).all()
+    tags = session.scalars(_GET_ALL_TAGS).all()
+
+    result = _TAG_LIST.validate_python(tags, from_attributes=True)
+    logger.info("✅ Получено %s тегов из базы данных.", len(result))
+    return result
 
-        result = [Tag.model_validate(tag) for tag in tags]
-        logger.info(f"✅ Получено {len(result)} тегов из базы данных.")
-        return result
 
+@with_readonly_session
+def tag_get_all_orm(session: Session) -> list[TagORM]:
+    """Получить все теги как ORM-объекты (без Pydantic, отсоединённые от сессии)"""
+    tags = session.scalars(_GET_ALL_TAGS).all()
+    logger.info("✅ Получено %s тегов (ORM) из базы данных.", len(tags))
+    return list(tags)
 
+
+@_TAG_CACHE.invalidates
 @with_transaction
 def tag_update(session: Session, tag_id: int, name: str) -> Tag:
     """
@@ -399,25 +684,31 @@ def tag_update(session: Session, tag_id: int, name: str) -> Tag:
     :param tag_id: ID тега для обновления.
     :param name: Новое имя тега.
     :return: Tag с обновлёнными данными
-    :raises ValueError: Если тег не найден
+    :raises NotFoundError: Если тег не найден
+    :raises AlreadyExistsError: Если имя уже занято другим тегом
     """
     tag = session.get(TagORM, tag_id)
 
     if not tag:
         error_msg = f"Тег с ID={tag_id} не найден"
-        logger.error(f"❌ {error_msg}")
-        raise ValueError(error_msg)
+        logger.error("❌ %s", error_msg)
+        raise NotFoundError(error_msg)
 
     # Обновляем имя
     tag.name = name
-    session.flush()
-    session.refresh(tag)
+    try:
+        session.flush()
+    except IntegrityError as e:
+        error_msg = f"Тег с именем '{name}' уже существует"
+        logger.error("❌ %s", error_msg)
+        raise AlreadyExistsError(error_msg) from e
 
     result = Tag.model_validate(tag)
-    logger.info(f"✅ Тег обновлён: ID={tag_id}, Name={name}")
+    logger.info("✅ Тег обновлён: ID=%s, Name=%s", tag_id, name)
     return result
 
 
+@_TAG_CACHE.invalidates
 @with_transaction
 def tag_delete(session: Session, tag_id: int) -> int:
     """
@@ -431,24 +722,23 @@ def tag_delete(session: Session, tag_id: int) -> int:
     - M2M связи с продуктами удаляются автоматически благодаря CASCADE
     - Продукты остаются в БД, удаляются только записи в ассоциативной таблице
     """
-    # Загружаем тег со связями для подсчёта
-    stmt = (
-        select(TagORM).where(TagORM.id == tag_id).options(selectinload(TagORM.products))
+    # Подсчёт связанных продуктов для логирования (COUNT(*) по ассоциативной таблице)
+    products_count = session.scalar(_COUNT_TAG_PRODUCTS, {"id": tag_id})
+
+    # Один DELETE ... RETURNING вместо SELECT + DELETE, строки ассоциативной
+    # таблицы удаляет сама БД (ondelete="CASCADE")
+    deleted_id = session.scalar(
+        _DELETE_TAG,
+        {"id": tag_id},
+        execution_options={"synchronize_session": False},
     )
-    tag = session.execute(stmt).scalar_one_or_none()
-
-    if not tag:
-        logger.warning(f"❌ Тег с ID={tag_id} не найден")
+    if deleted_id is None:
+        logger.warning("❌ Тег с ID=%s не найден", tag_id)
         return -1
-
-    # Подсчёт связанных продуктов для логирования
-    products_count = len(tag.products)
-
-    session.delete(tag)
     # Commit выполнится автоматически декоратором
 
     logger.info(
-        f"✅ Тег ID={tag_id} удалён. Удалено связей с продуктами: {products_count}"
+        "✅ Тег ID=%s удалён. Удалено связей с продуктами: %s", tag_id, products_count
     )
     return tag_id
 
@@ -458,6 +748,124 @@ def tag_delete(session: Session, tag_id: int) -> int:
 # ============================================
 
 
+def _categories_by_ids(session: Session, category_ids: set[int]) -> dict[int, Category]:
+    """
+    Загружает категории по ID одним запросом (только id и name, без ORM-объектов).
+
+    :param session: Открытая сессия
+    :param category_ids: ID категорий
+    :return: Словарь ID -> Category
+    :raises NotFoundError: Если какие-то категории не найдены
+    """
+    if not category_ids:
+        return {}
+
+    categories = {
+        category.id: category
+        for category in _CATEGORY_LIST.validate_python(
+            session.execute(_GET_CATEGORIES_BY_IDS, {"ids": list(category_ids)}).all(),
+            from_attributes=True,
+        )
+    }
+    missing_ids = category_ids - categories.keys()
+    if missing_ids:
+        error_msg = f"Категории с ID {missing_ids} не найдены"
+        logger.error("❌ %s", error_msg)
+        raise NotFoundError(error_msg)
+    return categories
+
+
+def _tags_by_ids(session: Session, tag_ids: set[int]) -> dict[int, Tag]:
+    """
+    Загружает теги по ID одним запросом (только id и name, без ORM-объектов).
+
+    :param session: Открытая сессия
+    :param tag_ids: ID тегов
+    :return: Словарь ID -> Tag
+    :raises NotFoundError: Если какие-то теги не найдены
+    """
+    if not tag_ids:
+        return {}
+
+    tags = {
+        tag.id: tag
+        for tag in _TAG_LIST.validate_python(
+            session.execute(_GET_TAGS_BY_IDS, {"ids": list(tag_ids)}).all(),
+            from_attributes=True,
+        )
+    }
+    missing_ids = tag_ids - tags.keys()
+    if missing_ids:
+        error_msg = f"Теги с ID {missing_ids} не найдены"
+        logger.error("❌ %s", error_msg)
+        raise NotFoundError(error_msg)
+    return tags
+
+
+def _products_create(session: Session, items: list[ProductCreate]) -> list[Product]:
+    """
+    Общая часть product_create и products_bulk_create (без декоратора).
+
+    Продукты вставляются одним INSERT ... RETURNING id (insertmanyvalues),
+    связи с тегами - одним INSERT в ассоциативную таблицу. Категории и теги
+    проверяются одним запросом на все продукты; результат собирается из этих
+    данных в памяти, без повторного SELECT созданных продуктов.
+
+    :param session: Открытая сессия (транзакцией управляет вызывающий код)
+    :param items: Данные продуктов с category_id и tag_ids
+    :return: Список созданных Product со связями (в порядке items)
+    :raises NotFoundError: Если какая-то категория или тег не найдены
+    """
+    if not items:
+        return []
+
+    # 1. Проверяем категории (FK связь) - все ID одним запросом
+    categories = _categories_by_ids(
+        session, {item.category_id for item in items if item.category_id}
+    )
+
+    # 2. Проверяем теги (M2M связь) - все ID одним запросом
+    tags = _tags_by_ids(session, {tag_id for item in items for tag_id in item.tag_ids})
+
+    # 3. Вставляем продукты пачкой, ID возвращаются в порядке строк
+    fields = [
+        {field: getattr(item, field) for field in _PRODUCT_CORE_FIELDS}
+        for item in items
+    ]
+    # category_id=0 (как и None) - продукт без категории, так же как при проверке выше
+    rows = [
+        {**item_fields, "category_id": item.category_id or None}
+        for item_fields, item in zip(fields, items)
+    ]
+    product_ids = session.scalars(
+        insert(ProductORM).returning(ProductORM.id, sort_by_parameter_order=True),
+        rows,
+    ).all()
+
+    # 4. Связи с тегами одним INSERT (повторы tag_ids отбрасываются)
+    item_tag_ids = [list(dict.fromkeys(item.tag_ids)) for item in items]
+    tag_links = [
+        {"product_id": product_id, "tag_id": tag_id}
+        for product_id, ids in zip(product_ids, item_tag_ids)
+        for tag_id in ids
+    ]
+    if tag_links:
+        session.execute(insert(product_tag_association), tag_links)
+
+    # 5. Собираем результат из вставленных данных и уже загруженных категорий/тегов
+    return [
+        Product(
+            id=product_id,
+            **item_fields,
+            category=categories.get(item.category_id),
+            tags=[tags[tag_id] for tag_id in ids],
+        )
+        for product_id, item_fields, item, ids in zip(
+            product_ids, fields, items, item_tag_ids
+        )
+    ]
+
+
 @with_transaction
 def product_create(
     session: Session,
@@ -471,162 +879,286 @@ def product_create(
     :return: Product с данными созданного продукта
 
     Особенности:
-    - Строгая валидация: отсутствие категории или тегов вызовет ValueError
-    - M2M связь с тегами устанавливается через список объектов
-    - O2M связь с категорией через объект (category_id устанавливается автоматически)
-    """
-    # 1. Создаём базовый продукт через распаковку DTO
-    #    Исключаем служебные поля для связей
-    product_dict = product_data.model_dump(exclude={"category_id", "tag_ids"})
-    new_product = ProductORM(**product_dict)
-
-    # 2. Обрабатываем категорию (FK связь)
-    if product_data.category_id:
-        logger.info(f"Привязка категории ID: {product_data.category_id}")
-
-        category_orm = session.get(CategoryORM, product_data.category_id)
-
-        if not category_orm:
-            error_msg = f"Категория с ID {product_data.category_id} не найдена"
-            logger.error(f"❌ {error_msg}")
-            raise ValueError(error_msg)
-
-        # Привязываем через объект (SQLAlchemy автоматически установит category_id)
-        new_product.category = category_orm
-
-    # 3. Обрабатываем теги (M2M связь)
-    if product_data.tag_ids:
-        logger.info(f"Привязка тегов: {product_data.tag_ids}")
-
-        # Загружаем все теги одним запросом
-        tags_stmt = select(TagORM).where(TagORM.id.in_(product_data.tag_ids))
-        tags_orm = session.execute(tags_stmt).scalars().all()
-
-        # Проверяем, что все теги найдены
-        found_ids = {tag.id for tag in tags_orm}
-        missing_ids = set(product_data.tag_ids) - found_ids
-
-        if missing_ids:
-            error_msg = f"Теги с ID {missing_ids} не найдены"
-            logger.error(f"❌ {error_msg}")
-            raise ValueError(error_msg)
-
-        # Устанавливаем связь M2M
-        new_product.tags = list(tags_orm)
-
-    # 4. Сохраняем продукт
-    session.add(new_product)
-    session.flush()  # Применяем изменения для получения ID
-
-    # 5. Перезагружаем с полными связями для возврата
-    stmt = (
-        select(ProductORM)
-        .where(ProductORM.id == new_product.id)
-        .options(selectinload(ProductORM.category), selectinload(ProductORM.tags))
-    )
-    refreshed_product = session.execute(stmt).scalar_one()
+    - Строгая валидация: отсутствие категории или тегов вызовет NotFoundError
+    - Частный случай products_bulk_create для одного продукта
+    """
+    [result] = _products_create(session, [product_data])
 
-    result = Product.model_validate(refreshed_product)
+    # Список имён тегов собираем только если сообщение действительно попадёт в лог
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "✅ Продукт создан: ID=%s, Category=%s, Tags=%s",
+            result.id,
+            result.category.name if result.category else "Нет",
+            [tag.name for tag in result.tags],
+        )
+    return result
 
-    logger.info(
-        f"✅ Продукт создан: ID={result.id}, "
-        f"Category={result.category.name if result.category else 'Нет'}, "
-        f"Tags={[tag.name for tag in result.tags]}"
-    )
+
+@with_transaction
+def products_bulk_create(
+    session: Session,
+    items: list[ProductCreate],
+) -> list[Product]:
+    """
+    Массовое создание продуктов со связями в ОДНОЙ транзакции.
+
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
+    :param items: Данные продуктов (ProductCreate) с category_id и tag_ids
+    :return: Список созданных Product (в порядке items)
+    :raises NotFoundError: Если какая-то категория или тег не найдены
+        (в этом случае не создаётся ни один продукт)
+
+    Вместо M вызовов product_create (M транзакций и M INSERT) - один INSERT
+    для продуктов и один для связей с тегами.
+    """
+    result = _products_create(session, items)
+    logger.info("✅ Создано продуктов: %s", len(result))
     return result
 
 
-def product_get_by_id(session_local: sessionmaker, product_id: int) -> Product | None:
+def _orm_to_product(product: ProductORM) -> Product:
+    """
+    Собирает Product из загруженного ORM-объекта без повторной валидации.
+
+    Атрибуты уже прошли через типы столбцов БД, поэтому используется
+    model_construct (как в _products_from_rows). category и tags должны
+    быть загружены заранее (связи lazy="raise_on_sql").
+
+    :param product: ProductORM с загруженными category и tags
+    :return: Product со связями
+    """
+    category = product.category
+    return Product.model_construct(
+        id=product.id,
+        name=product.name,
+        description=product.description,
+        image_url=product.image_url,
+        price_shmeckles=product.price_shmeckles,
+        price_flurbos=product.price_flurbos,
+        category=(
+            Category.model_construct(id=category.id, name=category.name)
+            if category is not None
+            else None
+        ),
+        tags=[Tag.model_construct(id=tag.id, name=tag.name) for tag in product.tags],
+    )
+
+
+@with_readonly_session
+def product_get_by_id(session: Session, product_id: int) -> Product | None:
     """
     Получает продукт по ID с загрузкой категории и тегов.
 
-    :param session_local: Фабрика сессий SQLAlchemy.
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param product_id: ID продукта для получения.
     :return: Product или None, если продукт не найден.
     """
-    with session_local() as session:
-        stmt = (
-            select(ProductORM)
-            .where(ProductORM.id == product_id)
-            .options(selectinload(ProductORM.category), selectinload(ProductORM.tags))
-        )
+    product = session.execute(
+        _GET_PRODUCT_BY_ID, {"pid": product_id}
+    ).scalar_one_or_none()
+
+    if not product:
+        logger.warning("❌ Продукт с ID=%s не найден.", product_id)
+        return None
 
-        product = session.execute(stmt).scalar_one_or_none()
+    result = _orm_to_product(product)
+    logger.info("✅ Продукт с ID=%s успешно получен со связями.", product_id)
+    return result
 
-        if not product:
-            logger.warning(f"❌ Продукт с ID={product_id} не найден.")
-            return None
 
-        result = Product.model_validate(product)
-        logger.info(f"✅ Продукт с ID={product_id} успешно получен со связями.")
-        return result
+def _products_from_rows(session: Session, rows) -> list[Product]:
+    """
+    Собирает Product из строк Core без повторной валидации.
 
+    Данные пришли из БД и уже соответствуют схеме, поэтому DTO создаются через
+    model_construct (без прохода валидатора pydantic). Теги всех продуктов
+    загружаются одним запросом к ассоциативной таблице и раскладываются
+    по продуктам в Python.
 
-def product_get_all(
-    session_local: sessionmaker, skip: int = 0, limit: int = 100
-) -> list[Product]:
+    :param session: Открытая сессия
+    :param rows: Строки-отображения с полями продукта, category_id и category_name
+    :return: Список Product со связями
+    """
+    products = [
+        Product.model_construct(
+            id=row["id"],
+            name=row["name"],
+            description=row["description"],
+            image_url=row["image_url"],
+            price_shmeckles=row["price_shmeckles"],
+            price_flurbos=row["price_flurbos"],
+            category=(
+                Category.model_construct(
+                    id=row["category_id"], name=row["category_name"]
+                )
+                if row["category_id"] is not None
+                else None
+            ),
+            tags=[],
+        )
+        for row in rows
+    ]
+    if not products:
+        return products
+
+    tags_by_product = {product.id: product.tags for product in products}
+    tag_rows = session.execute(_GET_TAGS_BY_PRODUCT_IDS, {"ids": list(tags_by_product)})
+    for product_id, tag_id, tag_name in tag_rows:
+        tags_by_product[product_id].append(
+            Tag.model_construct(id=tag_id, name=tag_name)
+        )
+    return products
+
+
+@with_readonly_session
+def product_get_all(session: Session, skip: int = 0, limit: int = 100) -> list[Product]:
     """
     Получить все продукты с категориями и тегами.
 
-    :param session_local: Фабрика сессий SQLAlchemy.
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param skip: Количество записей для пропуска
     :param limit: Максимальное количество записей
     :return: Список всех Product со связями.
     """
-    with session_local() as session:
-        stmt = (
-            select(ProductORM)
-            .options(selectinload(ProductORM.category), selectinload(ProductORM.tags))
-            .offset(skip)
-            .limit(limit)
-        )
+    # Чтение без ORM: плоские строки Core + теги одним запросом
+    rows = session.execute(
+        _GET_PRODUCT_ROWS_PAGE, {"skip": skip, "limit": limit}
+    ).mappings()
 
-        products = session.execute(stmt).scalars().all()
+    result = _products_from_rows(session, rows)
+    logger.info("✅ Получено %s продуктов со связями из базы данных.", len(result))
+    return result
 
-        result = [Product.model_validate(p) for p in products]
-        logger.info(f"✅ Получено {len(result)} продуктов со связями из базы данных.")
-        return result
 
+def products_iter(
+    session_local: sessionmaker | Session, batch: int = _YIELD_PER
+) -> Iterator[Product]:
+    """
+    Потоково перебирает все продукты с категориями и тегами.
 
+    В отличие от product_get_all, список целиком не строится: строки Core
+    читаются пачками по batch (yield_per + partitions), для каждой пачки
+    DTO собираются через _products_from_rows (теги - одним IN-запросом),
+    в памяти одновременно находится не больше одной пачки.
+
+    Сессия открыта, пока генератор не исчерпан или не закрыт, поэтому
+    использовать в for или закрывать явно (close()).
+
+    :param session_local: Фабрика сессий или открытая сессия
+    :param batch: Размер пачки
+    :return: Итератор по Product со связями
+    """
+    with readonly_session(session_local) as session:
+        rows = session.execute(
+            _GET_ALL_PRODUCT_ROWS, execution_options={"yield_per": batch}
+        ).mappings()
+        for chunk in rows.partitions():
+            yield from _products_from_rows(session, chunk)
+
+
+@with_readonly_session
+def product_get_all_orm(
+    session: Session, skip: int = 0, limit: int = 100
+) -> list[ProductORM]:
+    """
+    Получить все продукты с категориями и тегами как ORM-объекты (без Pydantic).
+
+    Для внутреннего использования, когда нужны только атрибуты (.name, .category.name,
+    .tags) и валидация схемы лишняя. Объекты возвращаются отсоединёнными от сессии:
+    category и tags уже загружены, остальные связи недоступны (lazy="raise_on_sql").
+
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
+    :param skip: Количество записей для пропуска
+    :param limit: Максимальное количество записей
+    :return: Список ORM-объектов Product со связями.
+    """
+    products = session.scalars(_GET_PRODUCTS_PAGE, {"skip": skip, "limit": limit}).all()
+    logger.info("✅ Получено %s продуктов (ORM) из базы данных.", len(products))
+    return list(products)
+
+
+def _fts_match_query(search: str, column: str | None = None) -> str:
+    """
+    Превращает пользовательскую строку в безопасный FTS5-запрос.
+
+    Каждое слово берётся в кавычки (спецсимволы FTS5 не интерпретируются)
+    и ищется как префикс: "порт" найдёт "Портальная". Слова объединяются через AND.
+
+    :param column: Искать только в этом столбце products_fts (по умолчанию - во всех)
+    """
+    query = " ".join(f'"{word}"*' for word in re.findall(r"\w+", search))
+    if query and column:
+        return f"{column} : ({query})"
+    return query
+
+
+def _search_products(
+    session: Session,
+    search: str,
+    skip: int,
+    limit: int,
+    column: str | None = None,
+) -> list[Product]:
+    """
+    Страница продуктов по поисковой строке через индекс products_fts.
+
+    - Пустая строка (или только пробелы) - все продукты по порядку ID
+    - Строка без слов (например "!!!" или "%") - пустой список, запрос к БД
+      не выполняется: как и ILIKE '%!!!%', такой поиск ничего не находит
+    - Иначе - FTS5-запрос из _fts_match_query, по релевантности
+
+    Оба запроса собраны заранее (_SEARCH_PRODUCT_ROWS_PAGE, _GET_PRODUCT_ROWS_PAGE),
+    при вызове передаются только параметры. Строки Core (продукт + категория),
+    теги - одним запросом к ассоциативной таблице в _products_from_rows.
+
+    :param session: Открытая сессия
+    :param search: Поисковая строка пользователя
+    :param skip: Количество записей для пропуска
+    :param limit: Максимальное количество записей
+    :param column: Искать только в этом столбце products_fts (по умолчанию - во всех)
+    :return: Список Product со связями
+    """
+    params = {"skip": skip, "limit": limit}
+    if not search.strip():
+        rows = session.execute(_GET_PRODUCT_ROWS_PAGE, params).mappings()
+        return _products_from_rows(session, rows)
+
+    match_query = _fts_match_query(search, column=column)
+    if not match_query:
+        logger.info("⚠️ В запросе '%s' нет слов для поиска", search)
+        return []
+
+    rows = session.execute(
+        _SEARCH_PRODUCT_ROWS_PAGE, {**params, "q": match_query}
+    ).mappings()
+    return _products_from_rows(session, rows)
+
+
+@with_readonly_session
 def product_search_advanced(
-    session_local: sessionmaker, search: str, skip: int = 0, limit: int = 100
+    session: Session, search: str, skip: int = 0, limit: int = 100
 ) -> list[Product]:
     """
-    Расширенный поиск продуктов по названию, категории или тегам.
+    Расширенный поиск продуктов по названию, описанию, категории или тегам.
 
-    :param session_local: Фабрика сессий SQLAlchemy.
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param search: Поисковый запрос
     :param skip: Количество записей для пропуска (пагинация)
     :param limit: Максимальное количество записей (пагинация)
-    :return: Список найденных продуктов со связями
-    """
-    with session_local() as session:
-        logger.info(f"🔍 Расширенный поиск: '{search}'")
-
-        pattern = f"%{search}%"
-
-        stmt = (
-            select(ProductORM)
-            .outerjoin(ProductORM.category)
-            .outerjoin(ProductORM.tags)
-            .where(
-                or_(
-                    ProductORM.name.ilike(pattern),
-                    CategoryORM.name.ilike(pattern),
-                    TagORM.name.ilike(pattern),
-                )
-            )
-            .options(selectinload(ProductORM.category), selectinload(ProductORM.tags))
-            .distinct()
-            .offset(skip)
-            .limit(limit)
-        )
+    :return: Список найденных продуктов со связями (сначала наиболее релевантные)
 
-        products = session.execute(stmt).scalars().unique().all()
+    Поиск идёт по полнотекстовому индексу products_fts (SQLite FTS5) вместо
+    ILIKE '%...%' с JOIN по трём таблицам. Пустой запрос (или только пробелы)
+    возвращает все продукты, запрос без слов (например "!!!") - пустой список.
+    ORM-объекты не создаются: категория приходит в той же строке (LEFT JOIN),
+    теги - отдельным запросом без обратного JOIN к products.
+    """
+    logger.info("🔍 Расширенный поиск: '%s'", search)
 
-        result = [Product.model_validate(p) for p in products]
-        logger.info(f"✅ Найдено продуктов: {len(result)}")
-        return result
+    result = _search_products(session, search, skip, limit)
+    logger.info("✅ Найдено продуктов: %s", len(result))
+    return result
 
 
 @with_transaction
@@ -637,70 +1169,160 @@ def product_update(session: Session, product_data: ProductUpdate) -> Product:
     :param session: Сессия SQLAlchemy (передаётся декоратором).
     :param product_data: Данные продукта (ProductUpdate) с category_id и tag_ids
     :return: Product с данными обновлённого продукта
+    :raises NotFoundError: Если продукт, категория или какой-то из тегов не найдены
+
+    Продукт не загружается в сессию: столбцы обновляются одним
+    UPDATE ... RETURNING id, связи с тегами пересоздаются в ассоциативной таблице.
+    Сначала проверяется сам продукт (SELECT 1), затем категория и теги: для
+    несуществующего продукта ошибка всегда про продукт.
     """
-    # 1. Получаем существующий продукт
-    existing_product = session.get(ProductORM, product_data.id)
-    if not existing_product:
+    # 1. Продукт должен существовать
+    if session.scalar(_PRODUCT_EXISTS, {"id": product_data.id}) is None:
         error_msg = f"Продукт с ID {product_data.id} не найден для обновления"
-        logger.error(f"❌ {error_msg}")
-        raise ValueError(error_msg)
-
-    # 2. Обновляем поля продукта через распаковку DTO
-    product_dict = product_data.model_dump(exclude={"category_id", "tag_ids"})
-    for key, value in product_dict.items():
-        setattr(existing_product, key, value)
+        logger.error("❌ %s", error_msg)
+        raise NotFoundError(error_msg)
 
-    # 3. Обрабатываем категорию (FK связь)
+    # 2. Проверяем категорию и теги (id и name нужны для результата)
+    category = None
     if product_data.category_id is not None:
-        logger.info(f"Обновление категории ID: {product_data.category_id}")
-
-        # Получаем категорию по ID
-        category_orm = session.get(CategoryORM, product_data.category_id)
-
-        # Если её нет, выбрасываем ошибку
-        if not category_orm:
-            error_msg = f"Категория с ID {product_data.category_id} не найдена"
-            logger.error(f"❌ {error_msg}")
-            raise ValueError(error_msg)
-
-        # Привязываем через объект (SQLAlchemy автоматически установит category_id)
-        existing_product.category = category_orm
-    else:
-        # Если category_id None, отвязываем категорию
-        existing_product.category = None
-
-    # 4. Обрабатываем теги (M2M связь)
-    if product_data.tag_ids is not None:
-        logger.info(f"Обновление тегов: {product_data.tag_ids}")
-
-        # Загружаем все теги одним запросом
-        tags_stmt = select(TagORM).where(TagORM.id.in_(product_data.tag_ids))
-        tags_orm = session.execute(tags_stmt).scalars().all()
-
-        # Проверяем, что все теги найдены
-        found_ids = {tag.id for tag in tags_orm}
-        missing_ids = set(product_data.tag_ids) - found_ids
-
-        if missing_ids:
-            error_msg = f"Теги с ID {missing_ids} не найдены"
-            logger.error(f"❌ {error_msg}")
-            raise ValueError(error_msg)
-
-        # Устанавливаем связь M2M
-        existing_product.tags = list(tags_orm)
-    else:
-        # Если tag_ids None, очищаем теги
-        existing_product.tags = []
-
-    # 5. Сохраняем изменения продукта
+        logger.info("Обновление категории ID: %s", product_data.category_id)
+        categories = _categories_by_ids(session, {product_data.category_id})
+        category = categories[product_data.category_id]
+
+    tag_ids = list(dict.fromkeys(product_data.tag_ids or []))
+    if tag_ids:
+        logger.info("Обновление тегов: %s", tag_ids)
+    tags = _tags_by_ids(session, set(tag_ids))
+
+    # 3. Обновляем столбцы продукта одним UPDATE (пустой RETURNING - продукт
+    #    удалили параллельно после проверки)
+    product_dict = {
+        field: getattr(product_data, field) for field in _PRODUCT_CORE_FIELDS
+    }
+    updated_id = session.scalar(
+        update(ProductORM)
+        .where(ProductORM.id == product_data.id)
+        .values(**product_dict, category_id=product_data.category_id)
+        .returning(ProductORM.id),
+        execution_options={"synchronize_session": False},
+    )
+    if updated_id is None:
+        error_msg = f"Продукт с ID {product_data.id} не найден для обновления"
+        logger.error("❌ %s", error_msg)
+        raise NotFoundError(error_msg)
+
+    # 4. Пересоздаём строки ассоциативной таблицы (коллекция product.tags
+    #    не загружается)
+    session.execute(_DELETE_PRODUCT_TAGS, {"id": updated_id})
+    if tag_ids:
+        session.execute(
+            insert(product_tag_association),
+            [{"product_id": updated_id, "tag_id": tag_id} for tag_id in tag_ids],
+        )
+
+    # 5. Результат собирается из переданных данных, повторный SELECT не нужен
+    result = Product(
+        id=updated_id,
+        **product_dict,
+        category=category,
+        tags=[tags[tag_id] for tag_id in tag_ids],
+    )
+    # Список имён тегов собираем только если сообщение действительно попадёт в лог
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "✅ Продукт обновлён: ID=%s, Category=%s, Tags=%s",
+            result.id,
+            result.category.name if result.category else "Нет",
+            [tag.name for tag in result.tags],
+        )
+    return result
+
+
+# ============================================
+# Массовое заполнение БД
+# ============================================
+
+
+@_CATEGORY_CACHE.invalidates
+@_TAG_CACHE.invalidates
+@with_transaction
+def bulk_seed(
+    session: Session,
+    categories: list[CategoryCreate],
+    tags: list[TagCreate],
+    products: list[ProductSeed],
+) -> list[Product]:
+    """
+    Заполняет БД категориями, тегами и продуктами в ОДНОЙ транзакции.
+
+    :param session: Сессия SQLAlchemy (передаётся декоратором).
+    :param categories: Категории для создания (существующие по имени переиспользуются)
+    :param tags: Теги для создания (существующие по имени переиспользуются)
+    :param products: Продукты со ссылками на категорию и теги по имени
+    :return: Список созданных Product со связями
+    :raises NotFoundError: Если продукт ссылается на неизвестную категорию или тег
+
+    Особенности:
+    - Один commit вместо отдельной транзакции на каждую сущность
+    - ID категорий и тегов получаются через flush() до привязки к продуктам
+    """
+    # 1. Категории и теги: берём существующие, недостающие создаём пачкой
+    category_names = list(dict.fromkeys(c.name for c in categories))
+    category_map = {
+        c.name: c
+        for c in session.scalars(_GET_CATEGORIES_BY_NAMES, {"names": category_names})
+    }
+    new_categories = [
+        CategoryORM(name=name) for name in category_names if name not in category_map
+    ]
+
+    tag_names = list(dict.fromkeys(t.name for t in tags))
+    tag_map = {
+        t.name: t for t in session.scalars(_GET_TAGS_BY_NAMES, {"names": tag_names})
+    }
+    new_tags = [TagORM(name=name) for name in tag_names if name not in tag_map]
+
+    session.add_all(new_categories + new_tags)
+    session.flush()  # Получаем ID новых категорий и тегов
+
+    category_map.update((c.name, c) for c in new_categories)
+    tag_map.update((t.name, t) for t in new_tags)
+
+    # 2. Продукты со связями
+    new_products = []
+    for product_data in products:
+        if (
+            product_data.category_name
+            and product_data.category_name not in category_map
+        ):
+            error_msg = f"Категория '{product_data.category_name}' не найдена"
+            logger.error("❌ %s", error_msg)
+            raise NotFoundError(error_msg)
+
+        missing_tags = set(product_data.tag_names) - tag_map.keys()
+        if missing_tags:
+            error_msg = f"Теги {missing_tags} не найдены"
+            logger.error("❌ %s", error_msg)
+            raise NotFoundError(error_msg)
+
+        product = ProductORM(
+            **{field: getattr(product_data, field) for field in _PRODUCT_CORE_FIELDS}
+        )
+        product.category = category_map.get(product_data.category_name)
+        product.tags = [tag_map[name] for name in product_data.tag_names]
+        new_products.append(product)
+
+    session.add_all(new_products)
     session.flush()
-    session.refresh(existing_product)
+    # Commit выполнится автоматически декоратором
 
-    # 6. Возвращаем с полными связями
-    result = Product.model_validate(existing_product)
+    # Данные уже провалидированы схемой ProductSeed на входе
+    result = [_orm_to_product(product) for product in new_products]
     logger.info(
-        f"✅ Продукт обновлён: ID={result.id}, "
-        f"Category={result.category.name if result.category else 'Нет'}, "
-        f"Tags={[tag.name for tag in result.tags]}"
+        "✅ Заполнение БД: категорий создано %s, тегов создано %s, "
+        "продуктов создано %s",
+        len(new_categories),
+        len(new_tags),
+        len(result),
     )
     return result
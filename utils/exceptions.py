@@ -0,0 +1,22 @@
+"""
+Доменные ошибки CRUD операций.
+
+Это ожидаемые ошибки (нет связанной сущности, нарушение уникальности):
+они логируются одной строкой в месте возникновения, без трейсбека,
+и перехватываются на верхнем уровне приложения (main.py).
+
+Наследуются от ValueError для обратной совместимости с кодом,
+который ловил ValueError до их появления.
+"""
+
+
+class DatabaseOperationError(ValueError):
+    """Базовая ожидаемая ошибка операции с БД."""
+
+
+class NotFoundError(DatabaseOperationError):
+    """Запрошенная или связанная сущность не найдена."""
+
+
+class AlreadyExistsError(DatabaseOperationError):
+    """Нарушение уникальности (например, имя категории или тега уже занято)."""
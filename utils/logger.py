@@ -3,7 +3,66 @@
 Импортировать этот модуль в main.py для инициализации.
 """
 
+import atexit
 import logging
+import queue
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+
+from config import get_settings
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def buffered_file_handler(
+    path, formatter: logging.Formatter, capacity=1024
+) -> MemoryHandler:
+    """
+    Создаёт файловый обработчик с буферизацией записей в памяти.
+
+    Записи накапливаются в MemoryHandler и пишутся в файл пачкой: при заполнении
+    буфера (capacity записей), при записи уровня ERROR и выше, а также при выходе
+    из программы.
+
+    :param path: Путь к файлу логов
+    :param formatter: Форматтер для записи в файл
+    :param capacity: Сколько записей держать в буфере до сброса в файл
+    :return: MemoryHandler, который нужно добавить в логгер вместо FileHandler
+    """
+    file_handler = logging.FileHandler(path, encoding="utf-8")
+    file_handler.setFormatter(formatter)
+
+    buffered = MemoryHandler(
+        capacity=capacity,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True,
+    )
+    atexit.register(buffered.flush)
+    return buffered
+
+
+def queued_handler(*handlers: logging.Handler) -> QueueHandler:
+    """
+    Выносит запись логов в фоновый поток.
+
+    Логгер только кладёт запись в очередь (QueueHandler), а QueueListener
+    в отдельном потоке передаёт её обработчикам: запись в файл и консоль
+    не задерживает вызывающий код. При выходе из программы очередь
+    дописывается до конца.
+
+    :param handlers: Обработчики, которые пишут записи (со своими форматтерами)
+    :return: QueueHandler, который нужно добавить в логгер вместо них
+    """
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    handler = QueueHandler(log_queue)
+    # Сообщение (с трейсбеком) форматируется при постановке в очередь,
+    # префиксы (время, уровень) добавляют форматтеры обработчиков
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
 
 
 def setup_logging(
@@ -15,49 +74,61 @@ def setup_logging(
     :param level: Уровень логирования (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     :param log_file: Путь к файлу логов приложения
     :param sqlalchemy_log_file: Путь к файлу логов SQLAlchemy
+
+    SQL-запросы пишутся только при включённом db_echo в настройках (SQL_ECHO=1),
+    иначе логгер SQLAlchemy пропускает всё ниже WARNING.
+
+    Запись в файлы буферизуется (см. buffered_file_handler), консоль - без буфера.
+    Файлы и консоль пишутся в фоновом потоке (см. queued_handler).
     """
+    formatter = logging.Formatter(LOG_FORMAT)
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+
     # Настройка корневого логгера для приложения
     logging.basicConfig(
         level=level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         handlers=[
-            logging.FileHandler(log_file, encoding="utf-8"),
-            logging.StreamHandler(),
+            queued_handler(buffered_file_handler(log_file, formatter), console),
         ],
     )
 
     # Настройка отдельного логгера для SQLAlchemy
     sqlalchemy_logger = logging.getLogger("sqlalchemy.engine")
-    sqlalchemy_logger.setLevel(logging.INFO)  # Уровень для SQL запросов
+    # INFO - выводить SQL запросы, WARNING - только предупреждения и ошибки
+    sqlalchemy_logger.setLevel(
+        logging.INFO if get_settings().db_echo else logging.WARNING
+    )
 
     # Убираем стандартные обработчики (чтобы не дублировалось в app.log)
     sqlalchemy_logger.propagate = False
 
     # Добавляем свой обработчик для SQLAlchemy
-    sqlalchemy_handler = logging.FileHandler(sqlalchemy_log_file, encoding="utf-8")
-    sqlalchemy_handler.setFormatter(
-        logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    sqlalchemy_handler = buffered_file_handler(
+        sqlalchemy_log_file,
+        logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"),
     )
-    sqlalchemy_logger.addHandler(sqlalchemy_handler)
 
-    # Опционально: выводить SQL в консоль (закомментируйте если не нужно)
+    # Опционально: выводить SQL в консоль (уберите из queued_handler если не нужно)
     sqlalchemy_console = logging.StreamHandler()
     sqlalchemy_console.setFormatter(logging.Formatter("🗄️ SQL: %(message)s"))
-    sqlalchemy_logger.addHandler(sqlalchemy_console)
+    sqlalchemy_logger.addHandler(queued_handler(sqlalchemy_handler, sqlalchemy_console))
 
     logging.info("Логирование настроено")
-    logging.info(f"SQL логи сохраняются в: {sqlalchemy_log_file}")
+    logging.info("SQL логи сохраняются в: %s", sqlalchemy_log_file)
 
 
 def setup_debug_logging():
     """Подробное логирование для разработки."""
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.FileHandler("debug.log", encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+
     logging.basicConfig(
         level=logging.DEBUG,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler("debug.log", encoding="utf-8"),
-            logging.StreamHandler(),
-        ],
+        handlers=[queued_handler(file_handler, console)],
     )
 
     # SQLAlchemy с максимальной детализацией
@@ -66,23 +137,23 @@ def setup_debug_logging():
     sqlalchemy_logger.propagate = False
 
     sqlalchemy_handler = logging.FileHandler("sqlalchemy_debug.log", encoding="utf-8")
-    sqlalchemy_handler.setFormatter(
-        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-    )
-    sqlalchemy_logger.addHandler(sqlalchemy_handler)
+    sqlalchemy_handler.setFormatter(formatter)
+    sqlalchemy_logger.addHandler(queued_handler(sqlalchemy_handler))
 
     logging.info("Debug логирование настроено")
 
 
 def setup_production_logging():
     """Минимальное логирование для продакшена."""
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.FileHandler("production.log", encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+
     logging.basicConfig(
         level=logging.WARNING,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler("production.log", encoding="utf-8"),
-            logging.StreamHandler(),
-        ],
+        handlers=[queued_handler(file_handler, console)],
     )
 
     # В продакшене SQLAlchemy логи отключаем или минимизируем
@@ -110,6 +181,7 @@ def setup_custom_sqlalchemy_logging(
 
     sql_handler = logging.FileHandler(sql_log_file, encoding="utf-8")
     sql_handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+    sql_handler = queued_handler(sql_handler)
     sql_logger.addHandler(sql_handler)
 
     if include_params:
@@ -119,4 +191,4 @@ def setup_custom_sqlalchemy_logging(
         params_logger.propagate = False
         params_logger.addHandler(sql_handler)
 
-    logging.info(f"SQLAlchemy логи настроены: {sql_log_file}")
+    logging.info("SQLAlchemy логи настроены: %s", sql_log_file)